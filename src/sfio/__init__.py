@@ -11,7 +11,7 @@ __all__ = [
 
 rootname = "sfio"
 
-import inspect
+import os
 import sys
 from pathlib import Path
 
@@ -20,14 +20,19 @@ def abspath(path):
     return Path(path).expanduser().resolve().absolute()
 
 
-def relpath(path, parent=Path.cwd()):
-    path, parent = Path(path), Path(parent)
-    if parent in path.parents or parent == path:
+def relpath(path, parent=None):
+    path = Path(path)
+    if parent is None:
+        if not path.is_absolute():
+            return path
+        parent = Path.cwd()
+    try:
         return path.relative_to(parent)
-    return path
+    except ValueError:
+        return path
 
 
-rootdir = abspath(inspect.getfile(__import__(rootname))).parent
+rootdir = abspath(__file__).parent
 cwd = Path.cwd()  # launching directory
 swd = abspath(sys.path[0])  # script directory
 
@@ -65,8 +70,10 @@ def timefmt(timestamp, utc=False, **kwargs):
 # -------------------------------------------------------------
 
 
+import atexit
 import logging
 import logging.handlers
+import queue
 
 
 class FormatterIcon(logging.Formatter):
@@ -107,22 +114,49 @@ logfile = logging.handlers.WatchedFileHandler(logfile_path, delay=True)
 logfile.setFormatter(formatter_detailed)
 logfile.setLevel(logging.NOTSET + interactive * 999)
 
+# log file is written by a background thread, screen stays in order
+logqueue = logging.handlers.QueueListener(
+    queue.SimpleQueue(), logfile, respect_handler_level=True
+)
+logqueue.start()
+atexit.register(logqueue.stop)  # flush log file at exit
+logqueue_handler = logging.handlers.QueueHandler(logqueue.queue)
+
 logger = logging.getLogger(rootname)
 logger.setLevel(logging.INFO)  # INFO, DEBUG for -v, NOTSET for -vv
 logger.addHandler(screen)
-logger.addHandler(logfile)
+logger.addHandler(logqueue_handler)
+
+
+def log_directly():
+    """forked processes, e.g., workers of Lmpdump.parse_frames, have no
+    listener thread to drain the queue, write the log file directly
+    """
+    logger.removeHandler(logqueue_handler)
+    logger.addHandler(logfile)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=log_directly)
 
 
 # -------------------------------------------------------------
 
 
+import re
 import threading
+import traceback
+
+# shorten traceback, hide frames of this package and of this file
+trace_search = re.compile(f'File "/.*/src/{rootname}')
+trace_replacement = f'File "{{{rootname}.rootdir}}'
+trace_exclude = re.compile('|'.join([trace_search.pattern, 'File "<.*>",']))
+trace_always_exclude = re.compile(
+    r'__init__.py", line \d+, in (ERROR|WARNING|excepthook)'
+)
 
 
 def _format_exception(e, s, tb):
-    import re
-    import traceback
-
     if e is None:
         return []
 
@@ -130,12 +164,8 @@ def _format_exception(e, s, tb):
     stack = traceback.format_stack()
     trace_list_all = tb_exc[:1] + stack[:-1] + tb_exc[1:]
 
-    search = re.compile(f'File "/.*/src/{rootname}')
-    replacement = f'File "{{{rootname}.rootdir}}'
-    selfstr = r'__init__.py", line \d+, in (ERROR|WARNING|excepthook)'
-
-    exclude = re.compile('|'.join([search.pattern, 'File "<.*>",']))
-    always_exclude = re.compile(selfstr)
+    search, replacement = trace_search, trace_replacement
+    exclude, always_exclude = trace_exclude, trace_always_exclude
 
     trace_list = [
         search.sub(replacement, s)
@@ -157,7 +187,7 @@ def excepthook(e, s, tb, msg='uncaught exception', say=logger.error):
         return
     trace_list = _format_exception(e, s, tb)
     trace_str = indent(''.join(trace_list), '  ')
-    say(f"{msg}\n{trace_str}")
+    say("%s\n%s", msg, trace_str)
     if screen.level > logging.CRITICAL and logfile.level <= logging.CRITICAL:
         name = say.__name__.upper()
         icon = FormatterIcon.icons.get(getattr(logging, name, None), '')
@@ -215,10 +245,13 @@ def WARNING(msg: str = 'no message specified', exception=RuntimeWarning):
 if '-m' not in sys.argv:
     from .box import Box  # noqa: F401
 
+import functools
+
 from . import func  # noqa: F401
 from .supported_formats import available
 
 
+@functools.lru_cache(maxsize=32)
 def cls(name: str):
     name = name.strip().lower()
     info = available.get(f'.{name}', available.get(name, None))
@@ -237,8 +270,10 @@ def _filehandler(filepath, name=None):
     if isinstance(filepath, io.IOBase):
         filepath = filepath.name
     if name is None:
-        suffixes = Path(filepath).suffixes
-        name = ''.join([_ for _ in suffixes if _ != '.gz'])
+        # same as Path.suffixes without .gz, on the plain basename
+        name = os.path.basename(os.fspath(filepath))
+        suffixes = [] if name.endswith('.') else name.lstrip('.').split('.')
+        name = ''.join([f'.{_}' for _ in suffixes[1:] if _ != 'gz'])
     return cls(name)
 
 
@@ -251,29 +286,52 @@ def read(f, filetype=None, **kwargs):
     """read a file, detect file format by file extension"""
     import json
 
+    try:
+        from orjson import loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
+
     from .base import Section, Sectioned
 
-    self = file(f, filetype, **kwargs)
+    fpath = Path(f)
+    self = file(fpath, filetype, **kwargs)
     # try to load file cache
-    fcache = Path(f).with_name(f'_{Path(f).name}.cache')
+    fcache = fpath.with_name(f'_{fpath.name}.cache')
+    is_cached = is_stale = False
     try:
-        cache = json.load(open(fcache))
-        self.sections.update(cache.get('sections', {}))
-        self.scanned = cache.get('scanned', 0)
-        logger.info(f"skipped file scan, read from cache '{fcache.name}'")
-        # TODO: check hash of scanned part, rescan if not matching
+        # json, a cache next to the data cannot run code when loaded
+        with open(fcache, 'rb') as fc:
+            cache = json_loads(fc.read())
+        stat = self.stat
+        # file unchanged since cached, no need to rescan
+        is_cached = all(cache.get(k) == v for k, v in stat.items())
+        is_stale = not is_cached
+        # resume scanning only if the file was appended to, or from
+        # caches of older versions, which have no file stat
+        if is_cached or cache.get('size', -1) < stat['size']:
+            self.sections.update(cache.get('sections', {}))
+            self.scanned = cache.get('scanned', 0)
     except Exception:
-        pass
+        self.sections, self.scanned = {}, 0
     # scan sections and write cache
-    t0 = timestamp()
-    self.scan()
-    time_elapsed = timestamp() - t0
-    if time_elapsed > 8 and getattr(self, 'allow_cache', True):
-        logger.info(
-            f"file reading took {time_elapsed:.1f}s"
-            f", write cache '{fcache.name}'"
-        )
-        json.dump(self.cache, open(fcache, 'w'))
+    if is_cached:
+        logger.info("skipped file scan, read from cache '%s'", fcache.name)
+    else:
+        t0 = timestamp()
+        self.scan()
+        time_elapsed = timestamp() - t0
+        is_slow = time_elapsed > 8
+        if (is_slow or is_stale) and getattr(self, 'allow_cache', True):
+            if is_stale:
+                logger.info("file changed, update cache '%s'", fcache.name)
+            else:
+                logger.info(
+                    "file reading took %.1fs, write cache '%s'",
+                    time_elapsed,
+                    fcache.name,
+                )
+            with open(fcache, 'w') as fc:
+                json.dump(self.cache, fc)
     # parse the whole file if not Sectioned
     if not issubclass(self.__class__, Sectioned):
         return self.parse(Section(self))
@@ -291,7 +349,7 @@ def write(f, data, filetype=None, overwrite=False, **kwargs):
         if not overwrite and fpath.exists():
             answer = input(f'Overwrite "{fpath}"? [y/N] ')
             if not answer.lower() == 'y':
-                logger.info(f'Skip writing, found "{fpath}"')
+                logger.info('Skip writing, found "%s"', fpath)
                 return 0
         # # check if there is data
         # supported_data = [File, Section]
@@ -1,7 +1,9 @@
 __all__ = ['Atsk']
 
+import io
+import os
+
 import numpy as np
-import pandas as pd
 
 from . import ERROR
 from .base import Fortran_unformatted as fort
@@ -17,96 +19,173 @@ class Atsk(ReadOnly, Sectioned):
     """
 
     identifier = '0.8 Atomsk binary file'
+    magic = identifier.encode()
     dtype = 'int32'
     allow_cache = False
 
+    def __init__(self, name, **kwargs):
+        super().__init__(name, **kwargs)
+        self._mm = None  # memory-mapped file
+
+    def memmap(self):
+        """memory-map the file, None for compressed file"""
+        if self._mm is None and self.opener is io.FileIO:
+            with open(self.name, 'rb') as fh:
+                # start kernel read-ahead while the blocks are walked
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                self._mm = np.memmap(fh, dtype=np.uint8, mode='r')
+        return self._mm
+
+    def blocks(self, start_byte=0, num_bytes=None):
+        """iterate over blocks, yield (size, content, end byte position),
+        a known num_bytes is read in one go for compressed file
+        """
+        mm = self.memmap()
+        if mm is None and num_bytes is not None:
+            with self.open() as fd:
+                fd.seek(start_byte)
+                mm = fd.read(num_bytes)
+            start_byte, shift = 0, start_byte
+        else:
+            shift = 0
+        if mm is not None:
+            # views into the memory-mapped file or the buffer
+            offset = start_byte
+            while True:
+                m, b, offset = fort.view_block(mm, offset, self.dtype)
+                yield m, b, offset + shift
+        else:
+            offset = start_byte
+            with self.open() as fd:
+                fd.seek(offset)
+                while True:
+                    m, b = fort.get_block(fd, self.dtype)
+                    offset += 8 + m
+                    yield m, b, offset
+
+    def skip_blocks(self, start_byte=0):
+        """iterate over blocks without reading them, yield end byte position"""
+        mm = self.memmap()
+        if mm is not None:
+            offset = start_byte
+            while True:
+                m1 = fort.delimiter.unpack_from(mm, offset)[0]
+                m2 = fort.delimiter.unpack_from(mm, offset + 4 + m1)[0]
+                if m1 != m2:
+                    ERROR(f'start & end of block {m1} != {m2}', ValueError)
+                offset += 8 + m1
+                yield offset
+        else:
+            offset = start_byte
+            with self.open() as fd:
+                fd.seek(offset)
+                while True:
+                    offset += 8 + fort.skip_block(fd)
+                    yield offset
+
     def scan(self):
-        with self.open() as fd:
-            fd.seek(0)  # rewind the file
-
-            # check file header
-            self.start_section('header')
-            m, b = fort.get_block(fd, self.dtype)
-            if not fort.to_str(m, b) == self.identifier.ljust(m):
-                ERROR(f'not {self.identifier}')
-            _, N = fort.get_block(fd, self.dtype)
-            self.scanned = fd.tell()
-            self.end_section('header')
-
-            # file sections
-            for name, num_blocks, exist in [
-                ('box', 1, True),
-                ('atoms', 1, N[0]),
-                ('ionic_shells', 1, N[1]),
-                ('properties', 2, N[2]),
-                ('comments', 1, N[4]),
-            ]:
-                if bool(exist):
-                    self.start_section(name)
-                    for _ in range(num_blocks):
-                        fort.get_block(fd, self.dtype)
-                    self.scanned = fd.tell()
-                    self.end_section(name)
+        blocks = self.blocks(0)
+
+        # check file header
+        self.start_section('header')
+        m, b, _ = next(blocks)
+        magic = b.tobytes()
+        if len(magic) != m or magic.rstrip(b' ') != self.magic:
+            ERROR(f'not {self.identifier}')
+        _, N, self.scanned = next(blocks)
+        self.end_section('header')
+
+        # file sections, only need the block sizes
+        blocks = self.skip_blocks(self.scanned)
+        for name, num_blocks, exist in [
+            ('box', 1, True),
+            ('atoms', 1, N[0]),
+            ('ionic_shells', 1, N[1]),
+            ('properties', 2, N[2]),
+            ('comments', 1, N[4]),
+        ]:
+            if bool(exist):
+                self.start_section(name)
+                for _ in range(num_blocks):
+                    self.scanned = next(blocks)
+                self.end_section(name)
 
     def parse(self, section, dtype='dict'):
-        with self.open() as fd:
-            fd.seek(section.start_byte)
-            m, b = fort.get_block(fd, self.dtype)
-
-            if section.name == 'header':
-                _, N = fort.get_block(fd, self.dtype)
-                output = {
-                    'identifier': fort.to_str(m, b).strip(),
-                    'num_atoms': N[0],
-                    'num_ionic_shells': N[1],
-                    'num_property_entries': N[2],
-                    'num_properties': N[3],
-                    'num_comments': N[4],
-                }
-
-            elif section.name == 'box':
-                box_input = np.round(fort.to_float(64, b).reshape(3, 3).T, 6)
-                box = Box()
-                box.set_input(box_input, typ='basis')
-                # output
-                if dtype == 'obj':
-                    return box
-                output = {**box.input}
-
-            elif section.name == 'atoms':
-                atoms = fort.to_float(64, b).reshape(4, -1).T
-                output = {
-                    'x': atoms[:, 0],
-                    'y': atoms[:, 1],
-                    'z': atoms[:, 2],
-                    'atomic_number': atoms[:, 3].astype(np.int8),
-                }
-
-            elif section.name == 'ionic_shells':
-                # positions for core/shell model
-                shells = fort.to_float(64, b).reshape(4, -1).T
-                output = {
-                    'position': shells[:, 0],
-                    'number1': shells[:, 1],
-                    'number2': shells[:, 2],
-                    'number3': shells[:, 3],
-                }
-
-            elif section.name == 'properties':
-                # auxilary properties (velocity, forces, etc.)
-                props = fort.to_str(m, b).split()
-                P = fort.to_float(64, fort.get_block(fd, self.dtype)[1])
-                values = P.reshape(len(props), -1).T
-                output = {prop: values[:, i] for i, prop in enumerate(props)}
-
-            elif section.name == 'comments':
-                output = {'comments': fort.to_str(m, b).rstrip()}
-
+        """dtype='view' gives read-only arrays that view the memory-mapped
+        file without copying, dtype='dict' gives writable copies
+        """
+        blocks = self.blocks(section.start_byte, section.num_bytes)
+        m, b, _ = next(blocks)
+
+        if section.name == 'header':
+            _, N, _ = next(blocks)
+            output = {
+                'identifier': fort.to_str(m, b).strip(),
+                'num_atoms': N[0],
+                'num_ionic_shells': N[1],
+                'num_property_entries': N[2],
+                'num_properties': N[3],
+                'num_comments': N[4],
+            }
+
+        elif section.name == 'box':
+            box_input = np.round(fort.to_float(64, b), 6).reshape(3, 3).T
+            box = Box()
+            box.set_input(box_input, typ='basis')
             # output
-            if dtype == 'dict':
-                return output
-            elif dtype == 'df':
-                try:
-                    return pd.DataFrame(output)
-                except ValueError:
-                    return pd.Series(output)
+            if dtype == 'obj':
+                return box
+            output = {**box.input}
+
+        elif section.name == 'atoms':
+            # stored column-major, each row is a contiguous column
+            atoms = fort.to_float(64, b).reshape(4, -1)
+            output = {
+                'x': atoms[0],
+                'y': atoms[1],
+                'z': atoms[2],
+                'atomic_number': atoms[3].astype(np.int8),
+            }
+
+        elif section.name == 'ionic_shells':
+            # positions for core/shell model
+            shells = fort.to_float(64, b).reshape(4, -1)
+            output = {
+                'position': shells[0],
+                'number1': shells[1],
+                'number2': shells[2],
+                'number3': shells[3],
+            }
+
+        elif section.name == 'properties':
+            # auxilary properties (velocity, forces, etc.)
+            props = fort.to_str(m, b).split()
+            P = fort.to_float(64, next(blocks)[1])
+            output = dict(zip(props, P.reshape(len(props), -1)))
+
+        elif section.name == 'comments':
+            output = {'comments': fort.to_str(m, b).rstrip()}
+
+        # output
+        if dtype == 'view':
+            return output
+        elif dtype == 'dict':
+            return {
+                k: v.copy() if isinstance(v, np.ndarray) else v
+                for k, v in output.items()
+            }
+        elif dtype == 'df':
+            import pandas as pd
+
+            try:
+                return pd.DataFrame(output)
+            except ValueError:
+                return pd.Series(output)
+        elif dtype == 'arrow':
+            import pyarrow as pa
+
+            # zero-copy for numeric columns
+            if all(isinstance(v, np.ndarray) for v in output.values()):
+                return pa.table(output)
+            return pa.Table.from_pylist([output])
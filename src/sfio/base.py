@@ -9,13 +9,15 @@ __all__ = [
 ]
 
 import abc
-import gzip
+import functools
 import io
-from pathlib import Path
+import logging
+import os
+import struct
 
 import numpy as np
 
-from . import ERROR, logger
+from . import ERROR, func, logger
 
 
 class File(abc.ABC):
@@ -27,15 +29,36 @@ class File(abc.ABC):
         self.name = name
         self.kwargs = kwargs
         self.type = self.__class__.__name__
+        self._max_byte = None  # readable size, see File.max_byte
+        self._section_arrays = {}  # see Sectioned.get_section
         # handle compressed file
-        if not isinstance(name, int) and Path(name).suffix == ".gz":
+        if not isinstance(name, int) and os.fspath(name).endswith(".gz"):
+            import gzip
+
             self.opener = gzip.open
         else:
             self.opener = io.FileIO
 
+    @property
+    def stat(self):
+        """modification time and size, to check if the file has changed"""
+        st = os.stat(self.name)
+        return {'mtime': st.st_mtime_ns, 'size': st.st_size}
+
+    @property
+    def max_byte(self):
+        """readable size in bytes (decompressed for .gz), kept until
+        the scan goes past it, e.g., after the file has grown
+        """
+        if self._max_byte is None or self._max_byte < self.scanned:
+            with self.open() as f:
+                self._max_byte = f.seek(0, 2)
+        return self._max_byte
+
     @property
     def cache(self):
-        return {k: getattr(self, k) for k in ['scanned', 'sections']}
+        cache = {k: getattr(self, k) for k in ['scanned', 'sections']}
+        return {**cache, **self.stat}
 
     def __repr__(self):
         try:
@@ -48,8 +71,7 @@ class File(abc.ABC):
 
     def __iter__(self):
         with self.open() as f:
-            for line in f:
-                yield line
+            yield from func.iter_lines(f)
 
     def open(self):
         """open file, no buffering"""
@@ -98,7 +120,7 @@ class Section:
         name: str = 'file',
     ):
         self.file = _File
-        max_byte = _File.open().seek(0, 2)
+        max_byte = _File.max_byte
         self.start_byte = Sectioned.get_index(start_byte, max_byte)
         max_num_bytes = max(0, max_byte - self.start_byte)
         self.num_bytes = int(max(0, min(num_bytes, max_num_bytes)))
@@ -218,13 +240,19 @@ class Sectioned(abc.ABC):
         """Check index, get positive index of negative indexing.
         right=True allows (index == length) and negative index right shift by 1
         """
-        ix = index - right * (int(index >= 0) - int(index == 0))
-        if abs(ix) - int(ix < 0) >= length + right * int(index < 0):
+        # plain branches, this is called for every Section
+        if index < 0:
+            ix = index + length + right
+            in_range = ix >= 0
+        else:
+            ix = index
+            in_range = index < length + (right and index > 0)
+        if not in_range:
             ERROR(
                 f'index {index} is out of range for length of {length}',
                 IndexError,
             )
-        return ix + length * int(ix < 0) + right * int(index != 0)
+        return ix
 
     @staticmethod
     def get_section(File, name, start_byte=0, end_byte=-1, instance=None):
@@ -237,19 +265,31 @@ class Sectioned(abc.ABC):
             ERROR(
                 f"section '{name}' not found, choose from {allkeys}", KeyError
             )
-        # add EOF to incomplete section
-        if len(_sect) % 2:
-            _sect = _sect.copy() + [File.scanned]
         # check index and handle negative indexing
         start = File.get_index(start_byte, File.scanned, right=True)
         end = File.get_index(end_byte, File.scanned, right=True)
         if start >= end:
             ERROR(f"invalid byte-range [{start_byte}, {end_byte}]", IndexError)
+        # byte positions as (N, 2) array, reused until the section grows
+        key = (len(_sect), File.scanned)
+        cached = File._section_arrays.get(name)
+        if cached is not None and cached[0] is _sect and cached[1] == key:
+            _sect, starts, ends = cached[2:]
+        else:
+            # add EOF to incomplete section
+            pos = _sect + [File.scanned] if len(_sect) % 2 else _sect
+            pos = np.array(pos, dtype=np.int64).reshape(-1, 2)
+            starts, ends = pos[:, 0].copy(), pos[:, 1].copy()
+            File._section_arrays[name] = (_sect, key, pos, starts, ends)
+            _sect = pos
         # get relevant byte positions
-        _sect = np.array(_sect).reshape(-1, 2)
-        a0 = np.searchsorted(_sect[:, 0], start)
-        a1 = np.searchsorted(_sect[:, 1], end + 1) - 1
         N = _sect.shape[0]
+        if N == 1:
+            a0 = 0 if start <= starts[0] else 1
+            a1 = 0 if ends[0] <= end else -1
+        else:
+            a0 = np.searchsorted(starts, start)
+            a1 = np.searchsorted(ends, end + 1) - 1
         # no instances found
         if a0 >= N or a1 >= N or a0 < 0 or a1 < 0:
             ERROR(f"no '{name}' section", KeyError)
@@ -263,10 +303,8 @@ class Sectioned(abc.ABC):
                 a, b = _sect[instance]
                 return Section(File, a, b - a, name)
             else:
-                num_instances = a1 - a0 + 1
                 instances = []
-                for instance in range(num_instances):
-                    a, b = _sect[instance]
+                for a, b in _sect[a0 : a1 + 1].tolist():
                     instances.append(Section(File, a, b - a, name))
                 return Sections(instances)
 
@@ -298,8 +336,10 @@ class Fortran_unformatted:
 
     """
 
-    @staticmethod
-    def get_block(fh, dtype='int32'):
+    delimiter = struct.Struct('<i')
+
+    @classmethod
+    def get_block(cls, fh, dtype='int32'):
         """Get the next block.
 
         Returns:
@@ -309,17 +349,58 @@ class Fortran_unformatted:
         """
         size = np.dtype(dtype).itemsize
 
-        m1 = int(np.squeeze(np.fromfile(fh, dtype=dtype, count=1)))
-        b = np.fromfile(fh, dtype=np.dtype(dtype, m1), count=int(m1 / size))
-        m2 = int(np.squeeze(np.fromfile(fh, dtype=dtype, count=1)))
+        # one read for the delimiter, one read for block + end delimiter
+        m1 = cls.delimiter.unpack(fh.read(4))[0]
+        buf = fh.read(m1 + 4)
+        b = np.frombuffer(buf, dtype=dtype, count=m1 // size)
+        m2 = cls.delimiter.unpack_from(buf, m1)[0]
 
         if m1 != m2:
             # opening and ending delimiters are different
             ERROR('start & end of block %d != %d' % (m1, m2), ValueError)
-        logger.debug(f'block_size {m1} bytes')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('block_size %d bytes', m1)
 
         return (m1, b)
 
+    @classmethod
+    def view_block(cls, buf, offset=0, dtype='int32'):
+        """Get the block at byte offset of a buffer (e.g., np.memmap),
+        the content is a view into the buffer, no copy is made.
+
+        Returns:
+            A tuple containing::
+
+                Size (bytes), Content (a list of int32), Next offset
+        """
+        size = np.dtype(dtype).itemsize
+
+        m1 = cls.delimiter.unpack_from(buf, offset)[0]
+        b = np.ndarray((m1 // size,), dtype, buffer=buf, offset=offset + 4)
+        m2 = cls.delimiter.unpack_from(buf, offset + 4 + m1)[0]
+
+        if m1 != m2:
+            # opening and ending delimiters are different
+            ERROR('start & end of block %d != %d' % (m1, m2), ValueError)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('block_size %d bytes', m1)
+
+        return (m1, b, offset + 8 + m1)
+
+    @classmethod
+    def skip_block(cls, fh):
+        """Skip the next block without reading its content.
+
+        Returns:
+            Size (bytes)
+        """
+        m1 = cls.delimiter.unpack(fh.read(4))[0]
+        fh.seek(m1, 1)
+        m2 = cls.delimiter.unpack(fh.read(4))[0]
+        if m1 != m2:
+            ERROR('start & end of block %d != %d' % (m1, m2), ValueError)
+        return m1
+
     @staticmethod
     def put_block(fh, dtype, alist):
         """Write a list or array to a new block."""
@@ -331,9 +412,16 @@ class Fortran_unformatted:
         return
 
     @staticmethod
-    def to_str(m, b):
-        return b.view(np.dtype(f'S{m}'))[0].decode('utf-8')
+    @functools.lru_cache(maxsize=32)
+    def get_dtype(kind, size):
+        """cached numpy dtype, e.g., ('float', 64) for float64"""
+        return np.dtype(f'{kind}{size}')
 
     @staticmethod
-    def to_float(d, b):
-        return b.view(np.dtype(f'float{d}'))
+    def to_str(m, b):
+        # strip trailing null bytes, same as numpy bytes_ does
+        return b.tobytes()[:m].rstrip(b'\0').decode('utf-8')
+
+    @classmethod
+    def to_float(cls, d, b):
+        return b.view(cls.get_dtype('float', d))
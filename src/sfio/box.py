@@ -1,11 +1,11 @@
 __all__ = ['Box']
 
+import math
 import re
 import sys
 from types import MappingProxyType
 
 import numpy as np
-import pyarrow as pa
 
 from . import ERROR, logger
 from .func.box import BoxFunc as AddFunc
@@ -13,18 +13,32 @@ from .func.box import BoxFunc as AddFunc
 
 def normalize(a, order=2, axis=-1):
     """Normalize row-listed vectors of a"""
-    l2 = np.atleast_1d(np.linalg.norm(a, order, axis))
+    a = np.asarray(a, dtype=float)
+    if order == 2:
+        # plain sum of squares, skips the generic norm machinery
+        l2 = np.sqrt((a * a).sum(axis=axis, keepdims=True))
+    else:
+        l2 = np.linalg.norm(a, order, axis, keepdims=True)
     l2[l2 == 0] = 1.0
-    return np.atleast_1d(np.squeeze(a / np.expand_dims(l2, axis)))
+    return np.atleast_1d(np.squeeze(a / l2))
 
 
-def cross(v, u):
-    """Cross products of v and u (match row-by-row)"""
-    return normalize(np.cross(v, u))
+def acos(cos):
+    """Angle (degree) of a cosine, clamped to [-1, 1] against round-off"""
+    return math.acos(min(max(cos, -1.0), 1.0)) * rad2deg
 
 
-deg2rad = np.pi / 180.0
-rad2deg = 180.0 / np.pi
+def angle(u, v):
+    """Angle (degree) between 3-vectors u and v, in scalar math"""
+    uu = u[0] * u[0] + u[1] * u[1] + u[2] * u[2]
+    vv = v[0] * v[0] + v[1] * v[1] + v[2] * v[2]
+    uv = u[0] * v[0] + u[1] * v[1] + u[2] * v[2]
+    cos = uv / math.sqrt((uu or 1.0) * (vv or 1.0))
+    return acos(cos)
+
+
+deg2rad = math.pi / 180.0
+rad2deg = 180.0 / math.pi
 abg = ('alpha', 'beta', 'gamma')  # angle between b c, a c, a b
 
 
@@ -59,6 +73,9 @@ class BoxInputDict(dict):
             )
             for k in invalidkeys:
                 self.pop(k)
+        # always allow tilt if not orthogonal
+        if any([self[k] != 90 for k in abg]):
+            self.__dict__['allow_tilt'] = True
 
     def _check_allow_tilt(self, key, value):
         if key in abg and value != 90:
@@ -69,24 +86,33 @@ class BoxInputDict(dict):
                 self.__dict__['allow_tilt'] = True
 
 
+class _Schema:
+    """pyarrow schema of Box input, pyarrow is imported on first use"""
+
+    def __get__(self, obj, objtype=None):
+        import pyarrow as pa
+
+        return pa.schema(
+            [
+                ('x0', pa.float32()),
+                ('y0', pa.float32()),
+                ('z0', pa.float32()),
+                ('lx', pa.float32()),
+                ('ly', pa.float32()),
+                ('lz', pa.float32()),
+                ('alpha', pa.float32()),
+                ('beta', pa.float32()),
+                ('gamma', pa.float32()),
+                ('allow_tilt', pa.bool_()),
+                ('bx', pa.string()),
+                ('by', pa.string()),
+                ('bz', pa.string()),
+            ]
+        )
+
+
 class Box(AddFunc):
-    schema = pa.schema(
-        [
-            ('x0', pa.float32()),
-            ('y0', pa.float32()),
-            ('z0', pa.float32()),
-            ('lx', pa.float32()),
-            ('ly', pa.float32()),
-            ('lz', pa.float32()),
-            ('alpha', pa.float32()),
-            ('beta', pa.float32()),
-            ('gamma', pa.float32()),
-            ('allow_tilt', pa.bool_()),
-            ('bx', pa.string()),
-            ('by', pa.string()),
-            ('bz', pa.string()),
-        ]
-    )
+    schema = _Schema()
 
     def __init__(self, inputdict: dict = {}):
         self.input = BoxInputDict(
@@ -107,6 +133,7 @@ class Box(AddFunc):
             }
         )
         self.input.update(inputdict)
+        self._output_key = self._output = None  # cached output
 
         self.alias = {
             'vmd': 'lattice',
@@ -121,7 +148,9 @@ class Box(AddFunc):
         return self.report()
 
     def __getitem__(self, key):
-        return self.input.get(key, self.output[key])
+        if key in self.input:
+            return self.input[key]
+        return self.output[key]
 
     def __setitem__(self, key, value):
         self.input[key] = value
@@ -130,6 +159,11 @@ class Box(AddFunc):
 
     @property
     def output(self):
+        # reuse output if input parameters are unchanged
+        key = tuple(self.input.values())
+        if key == self._output_key:
+            return self._output
+
         _ = self.input.copy()
 
         for s in 'xyz':
@@ -138,8 +172,6 @@ class Box(AddFunc):
 
         lx, ly, lz = _['lx'], _['ly'], _['lz']
 
-        _['allow_tilt'] |= any([_[s] != 90 for s in abg])
-
         _['cos_alpha'] = ca = np.cos(_['alpha'] * deg2rad)
         _['cos_beta'] = cb = np.cos(_['beta'] * deg2rad)
         _['cos_gamma'] = cg = np.cos(_['gamma'] * deg2rad)
@@ -164,37 +196,67 @@ class Box(AddFunc):
         )
 
         # useful for coordinate transform
-        _['u'] = normalize(_['v'])
-        # useful for undo coordinate transform
-        _['u_inv'] = np.linalg.inv(_['u'])
+        _['u'] = u = normalize(_['v'])
+        # useful for undo coordinate transform,
+        # inverse of lower triangular u in closed form
+        (u00, _0, _0), (u10, u11, _0), (u20, u21, u22) = u
+        _['u_inv'] = np.array(
+            [
+                [1.0 / u00, 0.0, 0.0],
+                [-u10 / (u00 * u11), 1.0 / u11, 0.0],
+                [
+                    (u10 * u21 - u11 * u20) / (u00 * u11 * u22),
+                    -u21 / (u11 * u22),
+                    1.0 / u22,
+                ],
+            ]
+        )
 
         # face normal, useful for cartesian to crystal fractional
-        _['bn'] = np.r_[
-            cross(_['u'][1], _['u'][2]),
-            cross(_['u'][2], _['u'][0]),
-            cross(_['u'][0], _['u'][1]),
-        ].reshape(-1, 3)
+        # i.e., v_b x v_c, v_c x v_a, v_a x v_b
+        _['bn'] = normalize(
+            np.array(
+                [
+                    [ly * lz, -xy * lz, xy * yz - ly * xz],
+                    [0.0, lz * lx, -yz * lx],
+                    [0.0, 0.0, lx * ly],
+                ]
+            )
+        )
 
         # get rid of small zero
         p = 9  # number < 1E-p is 0
         for s in _:
-            try:
+            if s not in ('allow_tilt', 'bx', 'by', 'bz'):
                 _[s] = np.round(_[s], p)
-            except Exception:
-                continue
 
-        return MappingProxyType(_)
+        # constants of the BoxFunc methods, from the rounded values
+        _['lo'] = np.array([_['xlo'], _['ylo'], _['zlo']])
+        _['v_sum'] = np.sum(_['v'], axis=0)
+        _['v_len'] = np.sum(_['v'] ** 2.0, axis=1) ** 0.5
+        # distance between opposite faces
+        _['height'] = np.sum(np.dot(_['v'], _['bn'].T) ** 2.0, axis=1) ** 0.5
+
+        # output is cached, protect arrays from in-place changes
+        for s in ('v', 'u', 'u_inv', 'bn', 'lo', 'v_sum', 'v_len', 'height'):
+            _[s].flags.writeable = False
+
+        self._output_key, self._output = key, MappingProxyType(_)
+        return self._output
 
     # -----------------------------------------------
 
     def _format_input(self, argv: str):
         if isinstance(argv, str):
-            argv = re.split(r'\s*,\s*|\s+', argv.strip().replace('\n', ''))
+            if ',' in argv:
+                argv = re.split(r'\s*,\s*|\s+', argv.strip().replace('\n', ''))
+            else:
+                argv = argv.split()
         # check input length
         if len(argv) == 1:
             ERROR("Read Box from file is not yet implemented")  # TODO
         else:
-            return np.array(argv, dtype=float)
+            return np.asarray(argv, dtype=float)
 
     def _guess_type(self, argv):
         if argv is None:
@@ -221,12 +283,11 @@ class Box(AddFunc):
         if typ is None:
             typ = self._guess_type(data)
         # handle specific box type
-        _ = self.input
-        func = getattr(self, f'_input_{typ}')
-        _.update(func(data))
-        # always allow tilt if not orthogonal
-        if any([_[s] != 90 for s in abg]):
-            _['allow_tilt'] = True
+        try:
+            func = self.input_types[typ]
+        except KeyError:
+            ERROR(f"unknown Box input type '{typ}'", KeyError)
+        self.input.update(func(self, data))
         return typ
 
     def _input_basis(self, v: np.ndarray):
@@ -235,15 +296,14 @@ class Box(AddFunc):
         | v_b[0], v_b[1], v_b[2] |
         | v_c[0], v_c[1], v_c[2] |
         """
-        v = np.array(v).reshape(3, 3)
-        u = normalize(v)
+        va, vb, vc = np.reshape(v, (3, 3)).tolist()
         return {
-            'lx': v[0, 0],
-            'ly': v[1, 1],
-            'lz': v[2, 2],
-            'alpha': np.arccos(np.dot(u[1], u[2])) * rad2deg,
-            'beta': np.arccos(np.dot(u[0], u[2])) * rad2deg,
-            'gamma': np.arccos(np.dot(u[0], u[1])) * rad2deg,
+            'lx': va[0],
+            'ly': vb[1],
+            'lz': vc[2],
+            'alpha': angle(vb, vc),
+            'beta': angle(va, vc),
+            'gamma': angle(va, vb),
         }
 
     def _input_lmpdata(self, v: np.ndarray):
@@ -264,7 +324,8 @@ class Box(AddFunc):
 
     def _input_lmpdump(self, v: np.ndarray):
         """LMPDUMP: xlo, xhi, xy, ylo, yhi, xz, zlo, zhi, yz"""
-        return self._input_lmpdata(np.take(v, [0, 1, 3, 4, 6, 7, 2, 5, 8]))
+        xlo, xhi, xy, ylo, yhi, xz, zlo, zhi, yz = v
+        return self._input_lmpdata((xlo, xhi, ylo, yhi, zlo, zhi, xy, xz, yz))
 
     def _input_dcd(self, v: np.ndarray):
         """DCD: a, cos_gamma, b, cos_beta, cos_alpha, c"""
@@ -275,19 +336,28 @@ class Box(AddFunc):
             'lx': a,
             'ly': ly,
             'lz': lz,
-            'alpha': np.arccos(ca) * rad2deg,
-            'beta': np.arccos(cb) * rad2deg,
-            'gamma': np.arccos(cg) * rad2deg,
+            'alpha': acos(ca),
+            'beta': acos(cb),
+            'gamma': acos(cg),
         }
 
     def _input_lattice(self, v: np.ndarray):
         """Lattice Parameters: a, b, c, alpha, beta, gamma"""
         a, b, c, alpha, beta, gamma = v
-        ca = np.cos(alpha * deg2rad)
-        cb = np.cos(beta * deg2rad)
-        cg = np.cos(gamma * deg2rad)
+        ca = math.cos(alpha * deg2rad)
+        cb = math.cos(beta * deg2rad)
+        cg = math.cos(gamma * deg2rad)
         return self._input_dcd([a, cg, b, cb, ca, c])
 
+    # handlers of set_input, by input type
+    input_types = {
+        'basis': _input_basis,
+        'lmpdata': _input_lmpdata,
+        'lmpdump': _input_lmpdump,
+        'dcd': _input_dcd,
+        'lattice': _input_lattice,
+    }
+
     # -----------------------------------------------
 
     def report(self, typ='all'):
@@ -1,21 +1,36 @@
 import ast
 import base64
+import functools
+import math
 import re
 from collections.abc import Iterable
-from itertools import chain
 from pydoc import locate
 
 from . import ERROR
 
+try:
+    # SIMD base64, same results as base64
+    from pybase64 import b64decode, b64encode_as_string
+except ImportError:
+    from base64 import b64decode
+
+    def b64encode_as_string(s):
+        return base64.b64encode(s).decode('utf-8')
+
+
 pattern = {
     # file://
     'fileurl': r'(file:\/\/\S+)',
     # data:[<MIME type>][;base64],<data>
-    'dataurl': r'data:(?:([a-zA-Z]+)\/?([-+.:=\w]+))?(;base64)?,(.*)',
+    'dataurl': r'(?s)data:(?:([a-zA-Z]+)\/?([-+.:=\w]+))?(;base64)?,(.*)',
     # float('nan'), float('inf'), float('-inf)
     'naninf': r"^float\('(-?(?:inf|nan))'\)$",
 }
 pattern = {k: re.compile(v) for k, v in pattern.items()}
+# bound methods for the decode loop
+fileurl_match = pattern['fileurl'].match
+dataurl_fullmatch = pattern['dataurl'].fullmatch
+naninf_findall = pattern['naninf'].findall
 
 
 # ---------- Custom Encoder/Decoder ----------
@@ -31,9 +46,12 @@ from . import abspath
 
 def cvt_ndarray(array):  # numpy array
     shape = 'x'.join(map(str, array.shape)).replace(' ', '')
+    if not array.flags.c_contiguous:
+        array = np.ascontiguousarray(array)
     return {
         '__meta__': f":{array.dtype}:shape={shape}",
-        '__data__': np.ascontiguousarray(array).data,
+        # flat bytes view, keeps array alive
+        '__data__': array.reshape(-1).view(np.uint8).data,
     }
 
 
@@ -65,18 +83,33 @@ def cvt_bytes(byte):  # bytes to string
     return byte.decode('utf-8')
 
 
+@functools.lru_cache(maxsize=None)
+def classname(cls):  # e.g., numpy.ndarray, same as str(cls)
+    module = cls.__module__
+    if module == 'builtins':
+        return cls.__qualname__
+    return f"{module}.{cls.__qualname__}"
+
+
 # --------------------------------------------
 
 skip_types = (int, complex, type(None))
 
+# exact types that encode and decode return as they are
+plain_types = {str, bool, *skip_types}
+number_types = {bool, float, *skip_types}
+
+# strings that decode may change
+url_prefixes = ('data:', 'file:', 'float(')
+
 change_types = {
-    'dict_keys': list,
-    'numpy.intc': int,
-    'numpy.int32': int,
-    'numpy.int64': int,
-    'numpy.float32': float,
-    'numpy.float64': float,
-    'bytes': cvt_bytes,
+    type({}.keys()): list,
+    np.intc: int,
+    np.int32: int,
+    np.int64: int,
+    np.float32: float,
+    np.float64: float,
+    bytes: cvt_bytes,
 }
 
 custom_convert = {
@@ -90,53 +123,120 @@ custom_convert = {
 }
 
 
+buffer_types = (memoryview, bytes, bytearray)
+
+container_types = (tuple, list, set, dict)
+
+
+def _is_literal(obj):
+    # True if repr(obj) is a Python literal equal to obj
+    typ = type(obj)
+    if typ in (str, int, bool, type(None)):
+        return True
+    elif typ is float:
+        return math.isfinite(obj)
+    elif typ is dict:
+        return all(_is_literal(k) and _is_literal(v) for k, v in obj.items())
+    elif typ in container_types:
+        return all(map(_is_literal, obj))
+    return False
+
+
 # --------------------------------------------
 
 
 def _encode_object(obj):
     meta, data = '', obj
 
-    clstyp = str(type(obj)).split()[-1][1:-2]
+    clstyp = classname(type(obj))
     handler = custom_convert.get(clstyp, (None, None))[0]
     if handler is not None:
         data = handler(obj)
         if isinstance(data, dict):
             meta = data.get('__meta__', '')
             data = data.get('__data__', data)
-    try:
-        if ast.literal_eval(str(data)) == data:
-            data = str(data).replace(' ', '')
-    except Exception:
-        if handler is None:
-            ERROR(f"no '{clstyp}' encoder for {repr(obj)}")
+    if isinstance(data, buffer_types):
+        # raw buffer, base64 encoded as is
+        pass
+    elif type(data) in container_types and _is_literal(data):
+        # str() already round-trips through ast.literal_eval
+        data = str(data).replace(' ', '')
+    else:
+        try:
+            if ast.literal_eval(str(data)) == data:
+                data = str(data).replace(' ', '')
+        except Exception:
+            if handler is None:
+                ERROR(f"no '{clstyp}' encoder for {repr(obj)}")
 
     return (clstyp, meta, data)
 
 
+def _encode_float(obj):
+    # nan, inf, -inf are not supported by JSON
+    if np.isnan(obj):
+        return "float('nan')"
+    elif np.isinf(obj):
+        sign = '-' * (obj < 0)
+        return f"float('{sign}inf')"
+    return obj
+
+
+def _encode_list(obj):
+    # recursively encode items in list, plain items as they are
+    return [s if type(s) in plain_types else encode(s) for s in obj]
+
+
+def _encode_dict(obj):
+    # recursively encode values in dict, plain values as they are
+    return {
+        k: v if type(v) in plain_types else encode(v) for k, v in obj.items()
+    }
+
+
+def _encode_ndarray(obj):
+    # same data url as _encode_object + base64, without the detours
+    data = cvt_ndarray(obj)
+    return (
+        f"data:python/numpy.ndarray{data['__meta__']};base64,"
+        f"{b64encode_as_string(data['__data__'])}"
+    )
+
+
+def _passthrough(obj):
+    return obj
+
+
+# exact types that are encoded without building a data url
+encode_types = {
+    **{t: _passthrough for t in (str, bool) + skip_types},
+    float: _encode_float,
+    list: _encode_list,
+    dict: _encode_dict,
+    np.ndarray: _encode_ndarray,
+}
+
+
 def encode(obj, b64: bool = False):
-    clstyp = str(type(obj)).split()[-1][1:-2]
-    obj = change_types.get(clstyp, lambda _: _)(obj)
+    handler = encode_types.get(type(obj))
+    if handler is None:
+        obj = change_types.get(type(obj), _passthrough)(obj)
+        handler = encode_types.get(type(obj))
+    if handler is not None:
+        return handler(obj)
 
     if isinstance(obj, (str,) + skip_types):
         # e.g., str, complex, null
         return obj
 
     elif isinstance(obj, float):
-        # nan, inf, -inf are not supported by JSON
-        if np.isnan(obj):
-            return "float('nan')"
-        elif np.isinf(obj):
-            sign = '-' * (obj < 0)
-            return f"float('{sign}inf')"
-        return obj
+        return _encode_float(obj)
 
     elif isinstance(obj, list):
-        # recursively encode items in list
-        return [encode(s) for s in obj]
+        return _encode_list(obj)
 
     elif isinstance(obj, dict):
-        # recursively encode values in dict
-        return {k: encode(v) for k, v in obj.items()}
+        return _encode_dict(obj)
 
     elif isinstance(obj, (tuple, set)):
         # recursively encode items but do not return
@@ -156,7 +256,7 @@ def encode(obj, b64: bool = False):
     if b64 or not isinstance(data, str):
         if isinstance(data, str):
             data = data.encode('utf-8')
-        data = base64.b64encode(data).decode('utf-8')
+        data = b64encode_as_string(data)
         b64 = ';base64'
     else:
         b64 = ''
@@ -166,20 +266,19 @@ def encode(obj, b64: bool = False):
 
 def _decode_url(url):
     # handle file url (file://)
-    match_fileurl = pattern['fileurl'].match(url)
+    match_fileurl = fileurl_match(url)
     if match_fileurl:
         return icvt_path(match_fileurl[0])
 
     # skip if not data url (data:,)
-    match_dataurl = list(chain(*pattern['dataurl'].findall(url)))
-    if not match_dataurl:
+    match_dataurl = dataurl_fullmatch(url)
+    if match_dataurl is None:
         return url
-    else:
-        typ, subtyp, b64, data = match_dataurl
+    typ, subtyp, b64, data = match_dataurl.groups()
 
     # undo base64 encoding
     if b64:
-        data = base64.b64decode(data.encode('utf-8'))
+        data = b64decode(data)
         # try:
         #    data = data.decode('utf-8')
         # except UnicodeDecodeError:
@@ -189,14 +288,17 @@ def _decode_url(url):
     if not typ == 'python':
         return data
 
+    # objects with metadata (e.g., ndarray) carry a raw buffer
+    clstyp, meta = subtyp.partition(':')[::2]
+
     # build-in Python data type?
-    try:
-        data = ast.literal_eval(data)
-    except Exception:
-        pass
+    if not meta:
+        try:
+            data = ast.literal_eval(data)
+        except Exception:
+            pass
 
     # custom conversion
-    clstyp = subtyp.split(':')[0]
     handler = custom_convert.get(clstyp, (None, None))[1]
     if handler is not None:
         try:
@@ -211,26 +313,61 @@ def _decode_url(url):
     return locate(subtyp)(data)
 
 
+def _decode_dict(data):
+    # recursively decode values in dict, numbers as they are
+    return {
+        k: v if type(v) in number_types else decode(v) for k, v in data.items()
+    }
+
+
+def _decode_items(data):
+    # recursively decode items, numbers as they are
+    return type(data)(
+        [s if type(s) in number_types else decode(s) for s in data]
+    )
+
+
+def _decode_str(data):
+    # skip strings that cannot be decoded
+    if not data.startswith(url_prefixes):
+        return data
+    # nan, inf, -inf
+    match_naninf = naninf_findall(data)
+    if match_naninf:
+        return float(match_naninf.pop())
+    # decode file url and data url
+    return _decode_url(data)
+
+
+# exact types with a known decoder
+decode_types = {
+    **{t: _passthrough for t in (bool,) + skip_types},
+    dict: _decode_dict,
+    list: _decode_items,
+    tuple: _decode_items,
+    set: _decode_items,
+    str: _decode_str,
+    bytes: _decode_str,
+}
+
+
 def decode(data):
+    handler = decode_types.get(type(data))
+    if handler is not None:
+        return handler(data)
+
     if isinstance(data, skip_types):
         # e.g., int, complex, null
         return data
 
     elif isinstance(data, dict):
-        # recursively decode values in dict
-        return {k: decode(v) for k, v in data.items()}
+        return _decode_dict(data)
 
     elif isinstance(data, (list, tuple, set)):
-        # recursively decode items
-        return type(data)([decode(s) for s in data])
+        return _decode_items(data)
 
     elif isinstance(data, (str, bytes)):
-        # nan, inf, -inf
-        match_naninf = pattern['naninf'].findall(data)
-        if match_naninf:
-            return float(match_naninf.pop())
-        # decode file url and data url
-        return _decode_url(data)
+        return _decode_str(data)
 
     else:
         return data
@@ -248,7 +385,7 @@ def convert_old_dict_style(dct):
         if clstyp == 'numpy.ndarray':
             return encode(
                 np.frombuffer(
-                    base64.b64decode(data['array'].encode('utf-8')),
+                    b64decode(data['array']),
                     dtype=data['dtype'],
                 ).reshape(data['shape'])
             )
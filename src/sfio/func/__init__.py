@@ -1,67 +1,215 @@
-__all__ = ['flatten', 'search_in_file']
+__all__ = [
+    'flatten',
+    'iter_lines',
+    'map_file',
+    'search_in_file',
+    'read_columns',
+    'read_table',
+]
 
+import io
+import itertools
+import mmap
 import re
-from itertools import chain
+import warnings
+
+import numpy as np
+
+# plain containers and scalars, for the one-level fast path of flatten
+list_types = (list, tuple, set)
+atom_types = (int, float, complex, bool, str, bytes, type(None))
 
 
 def flatten(iterable):
+    # a list of lists of scalars, flattened in C
+    if type(iterable) in list_types and all(
+        type(i) in list_types and all(type(j) in atom_types for j in i)
+        for i in iterable
+    ):
+        return list(itertools.chain.from_iterable(iterable))
     return list(_flatten(iterable))
 
 
 def _flatten(iterable):
     """flatten deeply nested iterables"""
-    # return item if one item only
-    try:
-        if isinstance(iterable, (str, bytes)):
-            raise TypeError
-        iterator = iter(iterable)
-    except TypeError:
-        yield iterable
-        return
-    # multiple items, loop through them
+    # a stack of iterators, one per nesting level
+    stack = [iter((iterable,))]
+    while stack:
+        for i in stack[-1]:
+            # exact scalar types skip the failing iter() below
+            if type(i) in atom_types or isinstance(i, (str, bytes)):
+                yield i
+                continue
+            try:
+                stack.append(iter(i))
+            except TypeError:
+                yield i
+                continue
+            break  # descend into i
+        else:
+            stack.pop()
+
+
+def iter_lines(fd, bufsize=1 << 20):
+    """Iterate lines of a file chunk-by-chunk, keeping line ends.
+    Unlike iterating an unbuffered file, this does not read byte-by-byte.
+    """
+    tail = b''
     while True:
-        try:
-            i = next(iterator)
-            if isinstance(i, (str, bytes)):
-                raise TypeError
-            iterator = chain(iter(i), iterator)
-        except TypeError:
-            yield i
-        except StopIteration:
+        buf = fd.read(bufsize)
+        if not buf:
             break
+        # complete lines only, carry the partial last line
+        cut = buf.rfind(b'\n') + 1
+        if cut:
+            yield from io.BytesIO(tail + buf[:cut])
+            tail = buf[cut:]
+        else:
+            tail += buf
+    if tail:
+        yield tail
 
 
-def search_in_file(fd, patterns, seek=0, bufsize=1e6):
+def map_file(fd):
+    """Memory-map a whole file read-only, for a sequential scan.
+    Raise ValueError for an empty file.
+    """
+    mm = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+        # more aggressive readahead, pages can be dropped after use
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    return mm
+
+
+def search_in_file(fd, patterns, seek=0, bufsize=1 << 20):
     """Search patterns in a file chunk-by-chunk. Return starting byte positions."""
     patterns = list(flatten(patterns))
     matches = [[] if isinstance(b, bytes) else None for b in patterns]
 
     # remove invalid patterns, compile regex, and get num_bytes to overlap chunks
     pats = [(i, b) for i, b in enumerate(patterns) if isinstance(b, bytes)]
-    searches = [re.compile(b'^.*' + pat, re.M) for _, pat in pats]
+    searches = [(i, re.compile(pat)) for i, pat in pats]
+    # one pass finds all lines with any pattern
+    search = b'|'.join(b'(?:' + pat + b')' for _, pat in pats)
+    search = re.compile(search).search
     overlap = max([len(pattern[1]) for pattern in pats])
 
+    if isinstance(fd, io.FileIO):
+        # regular file, search its memory map in one go
+        try:
+            with map_file(fd) as mm:
+                _search_lines(mm, seek, 0, search, searches, matches)
+            fd.seek(0, io.SEEK_END)
+            return matches
+        except ValueError:
+            pass  # empty file
+
     # adjust buffer size to ensure len(pattern) < bufsize
     bufsize = int(bufsize * (overlap // bufsize + 1))
 
-    # start searching from seek position
-    last_start = fd.seek(seek)
+    # read chunks into one reused buffer, carrying the last partial line
+    buf = bytearray(2 * bufsize)
+    view = memoryview(buf)
+    pos0, size = fd.seek(seek), 0
     while True:
-        buf = fd.read(bufsize)
-        pos0 = fd.tell() - len(buf)
-        for (i, pat), search in zip(pats, searches):
-            pos = [pos0 + s.start() for s in re.finditer(search, buf)]
-            matches[i].extend(pos)
-        next_start = fd.tell() - overlap + 1
+        n = fd.readinto(view[size : size + bufsize])
+        size += n
+        _search_lines(buf, 0, pos0, search, searches, matches, size)
 
         # termination
-        if next_start == last_start:
-            # remove duplicates while maintaining order
-            return [
-                list(dict.fromkeys(v)) if v is not None else None
-                for v in matches
-            ]
-
-        # continue to the next chunk
-        last_start = next_start
-        fd.seek(next_start)
+        if not n:
+            return matches
+
+        # keep the partial line, or the overlap of a very long line
+        keep = buf.rfind(b'\n', 0, size) + 1
+        if size - keep >= bufsize:
+            keep = size - overlap + 1
+        buf[: size - keep] = buf[keep:size]
+        pos0, size = pos0 + keep, size - keep
+
+
+def _search_lines(buf, pos, pos0, search, searches, matches, end=None):
+    # record buf[pos:end], buf[0] is at pos0 of the file
+    end = len(buf) if end is None else end
+    m = search(buf, pos, end)
+    while m:
+        # positions are where the line starts
+        line_start = max(buf.rfind(b'\n', pos, m.start()) + 1, pos)
+        line_end = buf.find(b'\n', m.end(), end)
+        if line_end < 0:
+            line_end = end
+        # tell which patterns are in the line
+        line = buf[line_start:line_end]
+        # skip lines recorded from the overlap of the previous chunk
+        pos1 = pos0 + line_start
+        for i, s in searches:
+            if s.search(line) and (not matches[i] or matches[i][-1] < pos1):
+                matches[i].append(pos1)
+        m = search(buf, line_end, end)
+
+
+def read_columns(buf: bytes, names: list):
+    """Read whitespace-separated numeric columns into a dict of arrays.
+    Columns of integers are int64, others are float64.
+    Return None if buf contains non-numeric values.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(buf, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return None
+    ncols = len(names)
+    if values.size % ncols:
+        return None
+    # one contiguous array per column
+    values = values.reshape(-1, ncols).T.copy()
+
+    # use the first row to tell integer columns
+    first_row = re.search(rb'\S[^\n]*', buf)
+    first_row = first_row[0].split() if first_row else []
+    is_int = [s.lstrip(b'+-').isdigit() for s in first_row]
+
+    output = {}
+    for i, name in enumerate(names):
+        col = values[i]
+        if i < len(is_int) and is_int[i] and np.all(col == np.trunc(col)):
+            col = col.astype(np.int64)
+        output[name] = col
+    return output
+
+
+def read_table(buf: bytes, names: list, column_types: dict = None):
+    """Read whitespace-separated columns of any type into a dict of arrays,
+    using the multithreaded pyarrow csv reader.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as csv
+
+    def read(buf, trailing=False):
+        # a space at the end of every line gives an extra empty column
+        return csv.read_csv(
+            io.BytesIO(buf),
+            read_options=csv.ReadOptions(
+                column_names=[*names, ''] if trailing else names
+            ),
+            parse_options=csv.ParseOptions(delimiter=' '),
+            convert_options=csv.ConvertOptions(
+                column_types=column_types or {}, include_columns=names
+            ),
+        )
+
+    # pyarrow needs a single-character delimiter, extra spaces give
+    # empty fields that fail to parse, normalize spaces only then
+    table = None
+    if b'\t' not in buf:
+        trailing = buf.partition(b'\n')[0].endswith(b' ')
+        try:
+            table = read(buf, trailing)
+        except pa.ArrowInvalid:
+            pass
+    if table is None:
+        buf = re.sub(rb'[ \t]+', b' ', buf)
+        buf = re.sub(rb'(?m)^ | $', b'', buf)
+        table = read(buf)
+    return {k: table.column(k).to_numpy(zero_copy_only=False) for k in names}
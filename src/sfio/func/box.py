@@ -10,9 +10,7 @@ class BoxFunc:
     def fractional_xyz(self, pts: np.ndarray) -> np.ndarray:
         pts = np.atleast_2d(pts)
         _ = self.output
-        lo = np.array([_['xlo'], _['ylo'], _['zlo']])
-        norm = np.sum(np.dot(_['v'], _['bn'].T) ** 2.0, axis=1) ** 0.5
-        return np.dot(pts - lo, _['bn'].T) / norm
+        return np.dot(pts - _['lo'], _['bn'].T) / _['height']
 
     def bounding_box_check(self, pts: np.ndarray) -> dict:
         """check which points in pts is within bounding box"""
@@ -22,19 +20,13 @@ class BoxFunc:
         _ = self.output
         pts = np.atleast_2d(pts)
 
-        # lo and hi of each point
-        lo = np.array([_['xlo'], _['ylo'], _['zlo']]) - pts
-        hi = lo + np.sum(_['v'], axis=0)
-
         # normal vectors of box faces
         bn = _['bn']
 
-        # distance from origin to box faces
+        # distance from box faces, positive inward, as one matmul
         # (face_xlo face_ylo face_zlo face_xhi face_yhi face_zhi)
-        dist = np.c_[
-            np.dot(-bn, np.atleast_2d(lo).T).T,
-            np.dot(bn, np.atleast_2d(hi).T).T,
-        ]
+        d = np.dot(pts - _['lo'], bn.T)
+        dist = np.concatenate((d, np.dot(bn, _['v_sum']) - d), axis=1)
         inside = np.min(dist, axis=1) >= 0
         N = pts.shape[0] - np.sum(inside)
 
@@ -61,7 +53,7 @@ class BoxFunc:
         if np.sum(bbcheck['ix_in']) == pts.shape[0]:
             return self
         pbc = (list(flatten(pbc)) * 3)[:3]  # direction a, b, c
-        lo0 = np.array([_['xlo'], _['ylo'], _['zlo']])
+        lo0 = _['lo']
         # edit lo end
         lo1 = (_['xlo'], _['ylo'], _['zlo']) = np.min(
             np.r_[pts[bbcheck['ix_out']] - 1e-7, np.atleast_2d(lo0)], axis=0
@@ -75,7 +67,7 @@ class BoxFunc:
                 np.maximum(
                     (np.max(d_abc, axis=0) + 1e-7)
                     * (~np.array(pbc)).astype(int),
-                    np.sum(_['v'] ** 2.0, axis=1) ** 0.5,
+                    _['v_len'],
                 )
             ).T
             - shift.T
@@ -98,18 +90,12 @@ class BoxFunc:
         rep = np.abs(
             np.floor_divide(
                 bbcheck['dist'],
-                np.tile(np.sum(_['v'] ** 2.0, axis=1) ** 0.5, 2),
+                np.tile(_['v_len'], 2),
             )
             * np.tile(pbc, 2).astype(int)
         )
         rep[bbcheck['dist'] >= 0] = 0
-        shift = np.sum(
-            np.multiply(
-                np.ravel(rep).reshape(-1, 1),
-                np.tile(np.r_[_['v'], -_['v']], (pts.shape[0], 1)),
-            ).reshape(-1, 6, 3),
-            axis=1,
-        )
+        shift = np.dot(rep, np.r_[_['v'], -_['v']])
         return pts + shift
 
     def ghost(self, pts: np.ndarray, pbc=True):
@@ -127,7 +113,13 @@ class BoxFunc:
         pbc = (list(flatten(pbc)) * 3)[:3]  # direction a, b, c
         ref = pts  # np.copy(pts)
         L = np.array([_['a'] * pbc[0], _['b'] * pbc[1], _['c'] * pbc[2]])
-        shift = L[0] * _['u'][0] + L[1] * _['u'][1] + L[2] * _['u'][2]
+        S = L[:, None] * _['u']  # shift along a, b, c
+        # abc, a, b, c, ab, bc, ca
+        table = np.array(
+            [S[0] + S[1] + S[2], S[0], S[1], S[2]]
+            + [S[i] + S[j] for i, j in zip((0, 1, 2), (1, 2, 0))]
+        )
+        shift = table[0]
         side = (
             np.argmin(
                 np.c_[
@@ -139,10 +131,6 @@ class BoxFunc:
             * 2
             - 1
         )
-        yield ref + np.outer(side, shift)
-        for i in (0, 1, 2):
-            shift = L[i] * _['u'][i]
-            yield ref + np.outer(side, shift)
-        for i, j in zip((0, 1, 2), (1, 2, 0)):
-            shift = L[i] * _['u'][i] + L[j] * _['u'][j]
-            yield ref + np.outer(side, shift)
+        side = side[:, None]
+        for shift in table:
+            yield ref + side * shift
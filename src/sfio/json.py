@@ -4,6 +4,11 @@ from collections import OrderedDict
 from . import ERROR, abspath, dataurl, logger
 from .base import ReadWrite
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class Json(ReadWrite):
     """JavaScript Object Notation"""
@@ -15,19 +20,23 @@ class Json(ReadWrite):
 
     def parse(self, section, dtype='dict'):
         fpath = self.name
-        for codec in ['utf-8', 'windows-1254']:
+        # read once, then find the codec
+        with open(fpath, 'rb') as f:
+            raw = f.read()
+        for codec in ['utf-8-sig', 'windows-1254']:
             try:
-                open(fpath, encoding=codec).read()
+                text = raw.decode(codec)
                 break
-            except Exception:
+            except UnicodeDecodeError:
                 continue
-        with open(fpath, encoding=codec) as f:
-            try:
-                ordered = self.kwargs.get('ordered', True)
-                output = load(f, ordered=ordered)
-            except json.decoder.JSONDecodeError:
-                ERROR(f"cannot parse {fpath}")
-        logger.debug(f'read json file {fpath}')
+        else:
+            ERROR(f"cannot decode {fpath}")
+        try:
+            ordered = self.kwargs.get('ordered', True)
+            output = loads(text, ordered=ordered)
+        except json.decoder.JSONDecodeError:
+            ERROR(f"cannot parse {fpath}")
+        logger.debug('read json file %s', fpath)
         return output
 
     @classmethod
@@ -41,7 +50,7 @@ class Json(ReadWrite):
                 indent=kwargs.get('indent', 4),  # pretty print
                 ensure_ascii=False,
             )
-        logger.debug(f'wrote json file\n  {fpath}')
+        logger.debug('wrote json file\n  %s', fpath)
         return fpath
 
 
@@ -50,13 +59,14 @@ class Json(ReadWrite):
 
 class encoder(json.JSONEncoder):
     def default(self, obj):
-        try:
-            return json.JSONEncoder.default(self, obj)
-        except TypeError:
-            return dataurl.encode(obj)
+        # JSONEncoder.default only raises TypeError
+        return dataurl.encode(obj)
 
 
 def decoder(dct):
+    # nested objects are decoded already, only str and list values remain
+    if not any(isinstance(v, (str, list)) for _, v in dct):
+        return dict(dct)
     try:
         dct = OrderedDict(dct)
     except Exception:
@@ -72,8 +82,23 @@ def dumps(*args, **kwargs):
     return json.dumps(*args, **kwargs)
 
 
+def _decode(obj):
+    """decode dicts in one pass, same result as the json object hooks"""
+    if isinstance(obj, dict):
+        return dataurl.decode(obj)
+    elif isinstance(obj, list):
+        return [_decode(s) for s in obj]
+    return obj
+
+
 def loads(*args, **kwargs):
-    if kwargs.pop('ordered', True):
+    ordered = kwargs.pop('ordered', True)
+    if orjson is not None and len(args) == 1 and not kwargs:
+        try:
+            return _decode(orjson.loads(args[0]))
+        except orjson.JSONDecodeError:
+            pass  # e.g., NaN or Infinity, leave it to json
+    if ordered:
         kwargs.setdefault('object_pairs_hook', decoder)
     else:
         kwargs.setdefault('object_hook', dataurl.decode)
@@ -85,12 +110,8 @@ def dump(*args, **kwargs):
     return json.dump(*args, **kwargs)
 
 
-def load(*args, **kwargs):
-    if kwargs.pop('ordered', True):
-        kwargs.setdefault('object_pairs_hook', decoder)
-    else:
-        kwargs.setdefault('object_hook', dataurl.decode)
-    return json.load(*args, **kwargs)
+def load(fp, **kwargs):
+    return loads(fp.read(), **kwargs)
 
 
 # -------------------------------------------------------------
@@ -1,11 +1,94 @@
 __all__ = ['Lmpdata']
 
+import io
+import re
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from . import func, logger
 from .base import ReadOnly, Sectioned
 from .box import Box
 
+# ---------- atom styles ----------
+
+sect_basic = ['header', 'masses', 'atoms', 'velocities']
+sect_topo = ['bonds', 'angles', 'dihedrals', 'impropers']
+
+# define included sections
+atom_styles = {
+    **{
+        k: sect_basic + sect_topo
+        for k in [
+            'atomic',
+            'full',
+            'molecular',
+            'charge',
+            'dipole',
+            'sphere',
+            'ellipsoid',
+        ]
+    },
+    **{
+        k[:-1]: sect_basic + sect_topo[:i]
+        for i, k in enumerate(sect_topo[:3], 1)
+    },
+}
+
+
+def _insert(alist, item, pos):
+    return alist[:pos] + item + alist[pos:]
+
+
+# define atom columns
+cols_atomic = ['type', 'x', 'y', 'z']
+cols_molecular = _insert(cols_atomic, ['mol'], 0)
+cols_charge = _insert(cols_atomic, ['q'], 1)
+atom_columns = {
+    'atomic': cols_atomic,
+    'full': _insert(cols_molecular, ['q'], 2),
+    'charge': cols_charge,
+    'dipole': cols_charge + ['mux', 'muy', 'muz'],
+    'sphere': _insert(cols_atomic, ['diameter'], 1),
+    'ellipsoid': _insert(cols_atomic, ['ellipsoidflag', 'density'], 1),
+    **{k: cols_molecular for k in ['molecular', 'angle', 'bond', 'dihedral']},
+}
+
+# define atom column output/input formats
+wfmt = {
+    'id': '%d',
+    'type': '%d',
+    'mol': '%d',
+    'q': '%.6f',
+    'x': '%.6f',
+    'y': '%.6f',
+    'z': '%.6f',
+    'mux': '%.6f',
+    'muy': '%.6f',
+    'muz': '%.6f',
+    'diameter': '%f',
+    'density': '%f',
+    'ellipsoidflag': '%d',
+    'volume': '%f',
+}
+map_fmt = {'d': int, 'f': float, 's': str}
+rfmt = {k: map_fmt[wfmt[k][-1]] for k in wfmt}
+map_dtype = {int: np.int64, float: np.float64, str: object}
+
+# style info, built once per style
+style_info = {
+    style: {
+        'name': style,
+        'sections': atom_styles[style],
+        'atoms_cols': cols,
+        'atoms_rfmt': {k: rfmt[k] for k in cols},
+        'atoms_wfmt': {k: wfmt[k] for k in cols},
+        'atoms_dtype': {k: map_dtype[rfmt[k]] for k in cols},
+    }
+    for style, cols in atom_columns.items()
+}
+
 
 class Lmpdata(ReadOnly, Sectioned):
     """LAMMPS data file, see bottom of this file for file formats"""
@@ -23,9 +106,11 @@ class Lmpdata(ReadOnly, Sectioned):
         (0, 'dihedrals', b'Dihedrals'),
         (0, 'impropers', b'Impropers'),
     ]
+    # unique start patterns, searched by scan_bychunk
+    patterns = tuple(dict.fromkeys(start for *_, start in file_sections))
 
-    sect_basic = ['header', 'masses', 'atoms', 'velocities']
-    sect_topo = ['bonds', 'angles', 'dihedrals', 'impropers']
+    sect_basic = sect_basic
+    sect_topo = sect_topo
 
     @property
     def style(self):
@@ -36,26 +121,6 @@ class Lmpdata(ReadOnly, Sectioned):
 
     @style.setter
     def style(self, style):
-        # define included sections
-        atom_styles = {
-            **{
-                k: self.sect_basic + self.sect_topo
-                for k in [
-                    'atomic',
-                    'full',
-                    'molecular',
-                    'charge',
-                    'dipole',
-                    'sphere',
-                    'ellipsoid',
-                ]
-            },
-            **{
-                k[:-1]: self.sect_basic + self.sect_topo[:i]
-                for i, k in enumerate(self.sect_topo[:3], 1)
-            },
-        }
-
         # TODO: auto detect style
         while style not in atom_styles:
             if hasattr(self, '_style'):
@@ -66,54 +131,8 @@ class Lmpdata(ReadOnly, Sectioned):
             )
             style = input('lmpdata style = ')
 
-        def insert(alist, item, pos):
-            return alist[:pos] + item + alist[pos:]
-
-        # define atom columns
-        cols_atomic = ['type', 'x', 'y', 'z']
-        cols_molecular = insert(cols_atomic, ['mol'], 0)
-        cols_charge = insert(cols_atomic, ['q'], 1)
-        atom_columns = {
-            'atomic': cols_atomic,
-            'full': insert(cols_molecular, ['q'], 2),
-            'charge': cols_charge,
-            'dipole': cols_charge + ['mux', 'muy', 'muz'],
-            'sphere': insert(cols_atomic, ['diameter'], 1),
-            'ellipsoid': insert(cols_atomic, ['ellipsoidflag', 'density'], 1),
-            **{
-                k: cols_molecular
-                for k in ['molecular', 'angle', 'bond', 'dihedral']
-            },
-        }
-
-        # define atom column output/input formats
-        wfmt = {
-            'id': '%d',
-            'type': '%d',
-            'mol': '%d',
-            'q': '%.6f',
-            'x': '%.6f',
-            'y': '%.6f',
-            'z': '%.6f',
-            'mux': '%.6f',
-            'muy': '%.6f',
-            'muz': '%.6f',
-            'diameter': '%f',
-            'density': '%f',
-            'ellipsoidflag': '%d',
-            'volume': '%f',
-        }
-        map_fmt = {'d': int, 'f': float, 's': str}
-        rfmt = {k: map_fmt[wfmt[k][-1]] for k in wfmt}
-
         # record style info
-        self._style = {
-            'name': style,
-            'sections': atom_styles[style],
-            'atoms_cols': atom_columns[style],
-            'atoms_rfmt': {k: rfmt[k] for k in atom_columns[style]},
-            'atoms_wfmt': {k: wfmt[k] for k in atom_columns[style]},
-        }
+        self._style = dict(style_info[style])
 
     def scan_byline(self):
         with self.open() as fd:
@@ -145,13 +164,11 @@ class Lmpdata(ReadOnly, Sectioned):
                 self.start_section('header')
 
             # search patterns up to a required section
-            _, sects, starts = zip(*self.file_sections)
-            patterns = list(dict.fromkeys(starts))
-            bytelocs = func.search_in_file(fd, patterns, self.scanned)
+            bytelocs = func.search_in_file(fd, self.patterns, self.scanned)
             scanned = fd.tell()
 
             # lookup tables
-            matches = dict(zip(patterns, bytelocs))
+            matches = dict(zip(self.patterns, bytelocs))
 
             # mark start and end of the sections
             for i, (req, sect, start) in enumerate(self.file_sections):
@@ -165,35 +182,47 @@ class Lmpdata(ReadOnly, Sectioned):
             self.scanned = scanned
 
     def scan(self, method='chunk'):
-        logger.debug(f"Scan {self.type} file using '{method}' method.")
+        logger.debug("Scan %s file using '%s' method.", self.type, method)
         return getattr(self, f"scan_by{method}")()
 
     def parse(self, section, dtype='dict'):
-        def loop_lines(f, skip=0):
+        def split_lines(raw, skip=0):
             """strip comments and skip empty lines"""
-            comment = b''
-            skipped = 0
-            for line in f:
-                ix = line.find(b'#')
-                if ix >= 0:
-                    line, comment = line[:ix], line[ix + 1 :].strip()
-                line = line.strip()
-                if line:
-                    if skipped >= skip:
-                        yield line.decode(), comment.decode()
-                    else:
-                        skipped += 1
+            rows = [line.partition('#') for line in raw.decode().split('\n')]
+            rows = [(line.strip(), c.strip()) for line, _, c in rows]
+            return [row for row in rows if row[0]][skip:]
+
+        def read_columns(body, names, dtypes):
+            """read columns into a dict of arrays, without a dataframe"""
+            # read with pyarrow if rows are just the named columns
+            row = re.search(rb'\S[^\n]*', body)
+            if row and len(row[0].split()) == len(names):
+                types = {k: pa.from_numpy_dtype(v) for k, v in dtypes.items()}
+                try:
+                    return func.read_table(body, names, types)
+                except pa.ArrowInvalid:
+                    pass
+            # otherwise with pandas, e.g., image flags, comments
+            table = pd.read_csv(
+                io.BytesIO(body),
+                sep=r'\s+',
+                engine='c',
+                header=None,
+                names=names,
+                usecols=range(len(names)),
+                comment='#',
+                dtype=dtypes,
+            )
+            return {k: table[k].values for k in names}
 
         if section.name == 'header':
-            output = {}
-            for line, _ in loop_lines(section.f):
-                v, k = line.split(None, 1)
-                k = f"num_{k.replace(' ', '_')}"
-                output[k] = int(v)
+            lines = split_lines(section.raw)
+            rows = [line.split(None, 1) for line, _ in lines]
+            output = {f"num_{k.replace(' ', '_')}": int(v) for v, k in rows}
 
         elif section.name == 'box':
             box = Box()
-            lines = [line for line, _ in loop_lines(section.f)]
+            lines = [line for line, _ in split_lines(section.raw)]
             box['allow_tilt'] = len(lines) > 3
             lines.append(' 0.0 0.0 0.0' * (not box['allow_tilt']))
             box_input = ' '.join(
@@ -206,52 +235,46 @@ class Lmpdata(ReadOnly, Sectioned):
             output = {**box.input}
 
         elif section.name == 'masses':
-            col_labels = ['id', 'mass']
-            output = {'id': [], 'mass': [], 'label': []}
-            for line, label in loop_lines(section.f, skip=1):
-                ID, mass = line.split()
-                output['id'].append(ID)
-                output['mass'].append(round(float(mass), 6))
-                output['label'].append(label)
+            rows = [
+                (*line.split(None, 1), label)
+                for line, label in split_lines(section.raw, skip=1)
+            ]
+            ids, masses, labels = zip(*rows) if rows else ((), (), ())
+            output = {
+                'id': list(ids),
+                'mass': [round(float(mass), 6) for mass in masses],
+                'label': list(labels),
+            }
 
         elif section.name == 'atoms':
             # get column labels
-            _, self.style = next(loop_lines(section.f))
+            raw = section.raw
+            line, _, body = raw.partition(b'\n')
+            _, self.style = split_lines(line)[0]
             col_labels = self.style['atoms_cols']
-            # read atoms and create dataframe
-            atoms = pd.read_csv(
-                section.f,
-                sep=r'\s+',
-                header=0,
-                names=col_labels,
-            )
-            atoms.sort_index(inplace=True)
-            output = {k: atoms[k].values for k in col_labels}
+            names = ['id', *col_labels]
+            dtypes = {'id': np.int64, **self.style['atoms_dtype']}
+            output = read_columns(body, names, dtypes)
+            # sort atoms by id, unless already in order
+            ids = output.pop('id')
+            if np.any(ids[1:] < ids[:-1]):
+                order = np.argsort(ids, kind='stable')
+                output = {k: v[order] for k, v in output.items()}
 
         elif section.name == 'velocities':
             col_labels = ['id', 'vx', 'vy', 'vz']
-            velocities = pd.read_csv(
-                section.f,
-                sep=r'\s+',
-                header=0,
-                names=col_labels,
-            )
-            velocities.sort_index(inplace=True)
-            output = {k: velocities[k].values for k in col_labels}
+            dtypes = {'id': np.int64, **dict.fromkeys(col_labels[1:], float)}
+            body = section.raw.partition(b'\n')[2]
+            output = read_columns(body, col_labels, dtypes)
 
         elif section.name in self.sect_topo:
             # get column labels
             N = min(self.sect_topo.index(section.name) + 2, 4)
             col_labels = ['id', 'type'] + [f'atom-{i+1}' for i in range(N)]
-            # read bonds/angles/dihedrals/impropers and create dataframe
-            topos = pd.read_csv(
-                section.f,
-                sep=r'\s+',
-                header=0,
-                names=col_labels,
-            )
-            topos.sort_index(inplace=True)
-            output = {k: topos[k].values for k in col_labels}
+            # read bonds/angles/dihedrals/impropers
+            dtypes = dict.fromkeys(col_labels, np.int64)
+            body = section.raw.partition(b'\n')[2]
+            output = read_columns(body, col_labels, dtypes)
 
         # output
         if dtype == 'dict':
@@ -1,10 +1,16 @@
 __all__ = ['Lmpdump']
 
+import io
 import os
-from itertools import zip_longest
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat, zip_longest
 from typing import Union
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
 
 from . import func, logger
 from .base import MultiFrames, ReadWrite
@@ -22,11 +28,23 @@ class Lmpdump(ReadWrite, MultiFrames):
         (1, 'atoms', b'ITEM: ATOMS', b'ITEM: TIMESTEP'),
     ]
 
+    # per-atom values that are always integers
+    int_columns = {'id', 'mol', 'type', 'proc', 'procp1', 'ix', 'iy', 'iz'}
+
+    def __init__(self, name, **kwargs):
+        super().__init__(name, **kwargs)
+        self._box = Box()  # reused when parsing box sections
+
     def scan_byline(self):
         with self.open() as fd:
             fd.seek(self.scanned)  # resume from last read
 
             for line in fd:
+                # only header lines start new sections
+                if line[:5] != b'ITEM:':
+                    self.scanned += len(line)
+                    continue
+
                 if line.startswith(b'ITEM: TIMESTEP'):
                     self.end_section('frame')
                     self.end_section('atoms')
@@ -41,7 +59,7 @@ class Lmpdump(ReadWrite, MultiFrames):
                     self.end_section('box')
                     self.start_section('atoms')
 
-                self.scanned = fd.tell()
+                self.scanned += len(line)
 
     def scan_bychunk(self):
         with self.open() as fd:
@@ -56,20 +74,64 @@ class Lmpdump(ReadWrite, MultiFrames):
             # lookup tables
             matches = dict(zip(patterns, bytelocs))
 
-            # mark start and end of the sections
-            for i, (req, sect, start, end) in enumerate(self.file_sections):
+            # mark start and end of the sections, same as calling
+            # end_section(b1), start_section(b0), end_section(b1)
+            for req, sect, start, end in self.file_sections:
+                section = self.sections.get(sect, [])
                 for b0, b1 in zip_longest(matches[start], matches[end]):
-                    self.scanned = b1
-                    self.end_section(sect)
-                    self.scanned = b0
-                    self.start_section(sect)
-                    self.scanned = b1
-                    self.end_section(sect)
+                    is_open = len(section) % 2
+                    if b1 is not None and is_open and b1 > section[-1]:
+                        section.append(b1)
+                    if b0 is None or len(section) % 2:
+                        continue
+                    if b0 >= (section or [0])[-1]:
+                        section.append(b0)
+                        if b1 is not None and b1 > b0:
+                            section.append(b1)
+                if section:
+                    self.sections[sect] = section
 
             self.scanned = scanned
 
-    def scan(self, method='chunk'):
-        logger.debug(f"Scan {self.type} file using '{method}' method.")
+    def scan_bymmap(self):
+        if self.opener is not io.FileIO:
+            # e.g., compressed file
+            return self.scan_bychunk()
+
+        with self.open() as fd:
+            try:
+                mm = func.map_file(fd)
+            except ValueError:
+                # empty file
+                return self.scan_bychunk()
+
+        with mm:
+            # jump between 'ITEM: ' at the start of lines
+            pos = mm.find(b'ITEM: ', self.scanned)
+            while pos >= 0:
+                if pos == 0 or mm[pos - 1] == ord('\n'):
+                    item = mm[pos : pos + 16]
+                    self.scanned = pos
+                    if item.startswith(b'ITEM: TIMESTEP'):
+                        self.end_section('frame')
+                        self.end_section('atoms')
+                        self.start_section('frame')
+                        self.start_section('header')
+
+                    elif item.startswith(b'ITEM: BOX BOUNDS'):
+                        self.end_section('header')
+                        self.start_section('box')
+
+                    elif item.startswith(b'ITEM: ATOMS'):
+                        self.end_section('box')
+                        self.start_section('atoms')
+
+                pos = mm.find(b'ITEM: ', pos + 1)
+
+            self.scanned = len(mm)
+
+    def scan(self, method='mmap'):
+        logger.debug("Scan %s file using '%s' method.", self.type, method)
         return getattr(self, f"scan_by{method}")()
 
     def parse(self, section, dtype='dict'):
@@ -103,35 +165,44 @@ class Lmpdump(ReadWrite, MultiFrames):
         elif section.name == 'box':
             f = section.f
             line = f.readline().replace(b'ITEM: BOX BOUNDS', b'')
-            box = Box()
-            boundaries = line.strip().decode().split()[:3]
-            if boundaries:
-                box['bx'], box['by'], box['bz'] = boundaries
-            box['allow_tilt'] = b'xy xz yz' in line
-            tilt = ' 0.0' * (not box['allow_tilt'])
+            allow_tilt = b'xy xz yz' in line
+            boundaries = line.replace(b'xy xz yz', b'').decode().split()[:3]
+            tilt = ' 0.0' * (not allow_tilt)
             box_input = ' '.join(
                 [f"{f.readline().decode()}{tilt}" for _ in range(3)]
             )
+            # every input parameter is reset, so the box can be reused
+            box = self._box
             box.set_input(box_input, typ='lmpdump')
+            box.input.update(
+                zip(('bx', 'by', 'bz'), boundaries or ('pp',) * 3),
+                allow_tilt=allow_tilt,
+            )
             # output
             if dtype == 'obj':
-                return box
+                return Box(box.input)
             output = {**box.input}
 
         elif section.name == 'atoms':
             # read column labels
-            for line in section:
-                col_labels = line.decode().split()[3:]
-                break
-            # read atoms and create dataframe
-            atoms = pd.read_csv(
-                section.f,
-                sep=r'\s+',
-                header=1,
-                names=col_labels,
-            )
-            atoms.sort_index(inplace=True)
-            output = {k: atoms[k].values for k in col_labels}
+            line, _, raw = section.raw.partition(b'\n')
+            col_labels = line.decode().split()[2:]
+            # read atoms, numpy has less overhead for few atoms
+            output = None
+            if len(raw) < 1 << 16:
+                output = func.read_columns(raw, col_labels)
+            if output is None:
+                # pyarrow, numeric or not, e.g., element
+                output = func.read_table(
+                    raw,
+                    col_labels,
+                    {k: pa.int64() for k in self.int_columns & {*col_labels}},
+                )
+            # sort atoms by id, unless already in order
+            ids = output.get('id')
+            if ids is not None and np.any(ids[1:] < ids[:-1]):
+                order = np.argsort(ids, kind='stable')
+                output = {k: v[order] for k, v in output.items()}
 
         # output
         if dtype == 'dict':
@@ -142,6 +213,27 @@ class Lmpdump(ReadWrite, MultiFrames):
             except ValueError:
                 return pd.Series(output)
 
+    def parse_frames(self, indices=None, dtype='df', max_workers=None):
+        """Parse frames in parallel processes, in the order of indices"""
+        indices = range(len(self)) if indices is None else list(indices)
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1 or len(indices) < 2:
+            return [_parse_frame(self, i, dtype) for i in indices]
+        # each worker opens the file once, with the scanned sections
+        with ProcessPoolExecutor(
+            max_workers,
+            initializer=_init_worker,
+            initargs=(self.name, self.kwargs, self.scanned, self.sections),
+        ) as executor:
+            frames = executor.map(
+                _parse_frame,
+                repeat(None),
+                indices,
+                repeat(dtype),
+                chunksize=max(1, len(indices) // (4 * max_workers)),
+            )
+            return list(frames)
+
     # -----------------------------------------------
 
     @classmethod
@@ -158,33 +250,76 @@ class Lmpdump(ReadWrite, MultiFrames):
 
         # start writing
 
-        f = cls(fpath, mode='wb').open()
+        write_options = pa_csv.WriteOptions(
+            include_header=False, delimiter=' ', quoting_style='none'
+        )
+        # buffer the many small writes of every frame
+        f = io.BufferedWriter(cls(fpath, mode='wb').open(), 1 << 20)
 
+        box_input = None  # box of the previous frame
         for df in get_df():
             # header
             timestep = df.attrs.get('timestep', 0)
-            f.write(f"ITEM: TIMESTEP\n{timestep}\n".encode())
-            f.write(f"ITEM: NUMBER OF ATOMS\n{df.shape[0]}\n".encode())
+            header = [
+                f"ITEM: TIMESTEP\n{timestep}\n",
+                f"ITEM: NUMBER OF ATOMS\n{df.shape[0]}\n",
+            ]
+
+            # box lines, reused while the box is the same as the previous
+            if df.attrs['box'] != box_input:
+                box_input = df.attrs['box']
+                box = Box(box_input).output
+                bxbybz = ' '.join([box.get(f'b{s}', 'ff') for s in 'xyz'])
+
+                if box.get('allow_tilt', True):
+                    tilt_str = ' xy xz yz'
+                    tilt = [f" {box.get(s, 0.0)}" for s in ['xy', 'xz', 'yz']]
+                else:
+                    tilt_str = ''
+                    tilt = ['', '', '']
+
+                box_lines = [f"ITEM: BOX BOUNDS{tilt_str} {bxbybz}\n"]
+                for s, t in zip('xyz', tilt):
+                    box_lines.append(f"{box[s+'lo']} {box[s+'hi']}{t}\n")
+                box_lines = ''.join(box_lines)
+            header.append(box_lines)
+
+            # atoms, use index as id if there is no id column
+            cols = {str(c): v.to_numpy() for c, v in df.items()}
+            if 'id' not in cols:
+                cols = {'id': df.index.to_numpy(), **cols}
+            header.append(f"ITEM: ATOMS {' '.join(cols)}\n")
+            f.write(''.join(header).encode())
+            table = pa.table({c: float_text(v) for c, v in cols.items()})
+            pa_csv.write_csv(table, f, write_options)
 
-            # box
-            box = Box(df.attrs['box']).output
-            bxbybz = ' '.join([box.get(f'b{s}', 'ff') for s in 'xyz'])
+        f.close()
 
-            if box.get('allow_tilt', True):
-                tilt_str = ' xy xz yz'
-                tilt = [f" {box.get(s, 0.0)}" for s in ['xy', 'xz', 'yz']]
-            else:
-                tilt_str = ''
-                tilt = ['', '', '']
+        return os.stat(fpath).st_size
 
-            f.write(f"ITEM: BOX BOUNDS{tilt_str} {bxbybz}\n".encode())
-            for s, t in zip('xyz', tilt):
-                f.write(f"{box[s+'lo']} {box[s+'hi']}{t}\n".encode())
 
-            # atoms
-            f.write(b"ITEM: ATOMS id")
-            df.to_csv(f, sep=' ', mode='ab')
+def float_text(values):
+    """float values as text, keeping the decimal point of whole numbers
+    (0.0 rather than 0), so that they are read back as floats
+    """
+    if values.dtype.kind != 'f' or not (values == np.round(values)).any():
+        return values
+    text = pc.cast(pa.array(values), pa.string())
+    whole = pc.match_substring_regex(text, r'^-?[0-9]+$')
+    return pc.if_else(whole, pc.binary_join_element_wise(text, '.0', ''), text)
 
-        f.close()
 
-        return os.stat(fpath).st_size
+# -----------------------------------------------
+
+_worker_file = None  # Lmpdump of a parse_frames worker process
+
+
+def _init_worker(name, kwargs, scanned, sections):
+    global _worker_file
+    _worker_file = Lmpdump(name, **kwargs)
+    _worker_file.scanned, _worker_file.sections = scanned, sections
+
+
+def _parse_frame(file, index, dtype):
+    file = file or _worker_file
+    return file.parse(file.section('frame', index), dtype)
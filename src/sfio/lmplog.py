@@ -1,6 +1,6 @@
 __all__ = ['Lmplog']
 
-import copy
+import functools
 
 import numpy as np
 import pandas as pd
@@ -113,39 +113,102 @@ units_convert = {
     },
 }
 
-blank_output = {
-    'dataline': '',
-    'units': 'metal',
-    '_key': [],
-    **{k: 0 for k in ['_', 'n', 'Nrun', 'Nmin', 'Neq']},
-    **{k: [] for k in ['ix_min', 'ix_eq', 'key']},
-}
+
+def blank_output():
+    """a fresh output, for a new log"""
+    return {
+        'dataline': '',
+        'units': 'metal',
+        '_key': [],
+        '_rows': [],
+        **{k: 0 for k in ['_', 'n', 'Nrun', 'Nmin', 'Neq']},
+        **{k: [] for k in ['ix_min', 'ix_eq', 'key']},
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def unit_scale(key, units):
+    """scale factor to convert a thermo value of key to metal units"""
+    k = ialias.get(key, key)
+    if units.endswith('_to_metal') and k in unittyp:
+        return units_convert[units].get(unittyp[k], 1.0)
+    return 1.0
+
+
+@functools.lru_cache(maxsize=None)
+def converter(key, units):
+    """function to convert a thermo value string of key to metal units"""
+    if key in inttyp:
+        return int
+    scale = unit_scale(key, units)
+    if scale == 1.0:
+        return float
+    return lambda v: float(v) * scale
+
+
+@functools.lru_cache(maxsize=None)
+def thermo_columns(keys, units):
+    """lowercase thermo keys and their converters, once per header"""
+    keys = tuple(k.lower() for k in keys)
+    return keys, tuple(converter(k, units) for k in keys)
+
+
+def flush_rows(output):
+    """record the buffered rows of thermo_modify line one, at once"""
+    rows = output.get('_rows')
+    if not rows:
+        return
+    output['_rows'] = []
+
+    # convert each column at once, the first of repeated keywords wins
+    values = np.array(rows)
+    units = output['units']
+    columns = {}
+    for k, col in zip(output['_key'], values.T):
+        if k in columns:
+            continue
+        if k in inttyp:
+            columns[k] = col.astype(np.int64)
+        else:
+            columns[k] = col.astype(np.float64) * unit_scale(k, units)
+
+    # record data
+    for k, col in columns.items():
+        if k not in output:
+            output[k] = [np.nan] * output['n']
+        output[k] += col.tolist()
+    output['n'] += len(rows)
+    update_index(output)
+
+
+def update_index(output):
+    """update min and eq index"""
+    me = {-1: 'min', 1: 'eq'}[output['_']]
+    output[f'ix_{me}'][-1][1] = output['n'] - 1
+    if 'step' in output:
+        output[f'N{me}'] = sum(
+            [
+                output['step'][n[1]] - output['step'][n[0]]
+                if n and n[1] is not None
+                else 0
+                for n in output[f'ix_{me}']
+            ]
+        )
 
 
 def update_data(output):
+    # buffered rows come before this dataline
+    flush_rows(output)
     if output['dataline'].strip() == '':
         return
 
     ln = output['dataline'].split()
     output['dataline'] = ''
-    key = [k.lower() for k in ln[0::3]]
-
-    to_metal = output['units'].endswith('_to_metal')
-
-    def metal_unit(k, v):
-        k = ialias.get(k, k)
-        if to_metal and k in unittyp:
-            u = output['units']
-            v = v * units_convert[u].get(unittyp[k], 1.0)
-        return v
+    key, convert = thermo_columns(tuple(ln[0::3]), output['units'])
+    value = [f(v) for f, v in zip(convert, ln[2::3])]
 
-    value = [
-        int(v) if k in inttyp else metal_unit(k, float(v))
-        for k, v in zip(key, ln[2::3])
-    ]
-
-    # record data
-    outkey = []
+    # record data, outkey is an ordered set
+    outkey = {}
     for k, v in zip(key, value):
         if k in outkey:
             continue
@@ -155,7 +218,7 @@ def update_data(output):
             else:
                 output.update({k: []})
         output[k].append(v)
-        outkey.append(k)
+        outkey[k] = None
     output['n'] += 1
 
     # get key if not exist
@@ -164,29 +227,30 @@ def update_data(output):
     except Exception:
         # fill None to non-existing thermo keywords
         for k in output['key']:
-            if k not in key:
+            if k not in outkey:
                 output[k].append(np.nan)
         # accumulate thermo keywords
-        output['key'] += [s for s in outkey if s not in output['key']]
+        known = set(output['key'])
+        output['key'] += [s for s in outkey if s not in known]
         # link alias keys
         for c in outkey:
-            try:
+            if c in ialias:
                 output[ialias[c]] = output[c]
-            except Exception:
-                continue
 
-    # update min and eq index
-    me = {-1: 'min', 1: 'eq'}[output['_']]
-    output[f'ix_{me}'][-1][1] = output['n'] - 1
-    if 'step' in output:
-        output[f'N{me}'] = sum(
-            [
-                output['step'][n[1]] - output['step'][n[0]]
-                if n and n[1] is not None
-                else 0
-                for n in output[f'ix_{me}']
-            ]
-        )
+    update_index(output)
+
+
+line_prefixes = {
+    s[:2]: s
+    for s in [
+        'LAMMPS ',
+        'units ',
+        'minimize ',
+        'run ',
+        'Per MPI rank memory allocation ',
+        'Loop time of ',
+    ]
+}
 
 
 def parse_stream(self, line, to_metal=True):  # noqa: C901
@@ -195,10 +259,20 @@ def parse_stream(self, line, to_metal=True):  # noqa: C901
     """
     line = line.rstrip().replace('\t', ' ')
 
-    if line.startswith('LAMMPS '):
-        self.data = copy.deepcopy(blank_output)
+    # keyword lines, looked up by their first two characters
+    prefix = line_prefixes.get(line[:2])
+    if prefix is None or not line.startswith(prefix):
+        prefix = None
+        if 'ERROR: ' in line:
+            print(line.strip())
+    else:
+        # buffered thermo rows come before keyword lines
+        flush_rows(self.data)
+
+    if prefix == 'LAMMPS ':
+        self.data = blank_output()
 
-    elif line.startswith('units '):
+    elif prefix == 'units ':
         self.data['units'] = u = line.split()[1]
         if to_metal and u != 'metal':
             k = u + '_to_metal' * (u != 'metal')
@@ -207,11 +281,11 @@ def parse_stream(self, line, to_metal=True):  # noqa: C901
             else:
                 self.data['units'] = k
 
-    elif line.startswith('minimize '):
+    elif prefix == 'minimize ':
         self.data['ix_min'].append([self.data['n'], None])
         self.data['_'] = -1
         return
-    elif line.startswith('run '):
+    elif prefix == 'run ':
         try:
             self.data['Nrun'] += int(line.split()[1])
         except Exception:
@@ -220,18 +294,15 @@ def parse_stream(self, line, to_metal=True):  # noqa: C901
         self.data['_'] = 1
         return
 
-    elif line.startswith('Per MPI rank memory allocation '):
+    elif prefix == 'Per MPI rank memory allocation ':
         self.data['_'] *= 2
         self.data['_key'] = []
         return
-    elif line.startswith('Loop time of '):
+    elif prefix == 'Loop time of ':
         update_data(self.data)
         self.data['_'] = 0
         return
 
-    elif 'ERROR: ' in line:
-        print(line.strip())
-
     if '_' not in self.data or self.data['_'] == 0:
         return
 
@@ -269,14 +340,14 @@ def parse_stream(self, line, to_metal=True):  # noqa: C901
             return
 
     # ----- thermo_modify line one -----
-    elif len(ln) == nk:
+    elif ln and len(ln) == nk:
         try:
             [float(v) for v in ln]
-            self.data['dataline'] += ' '.join(
-                [f'{k} = {v}' for k, v in zip(self.data['_key'], ln)]
-            )
         except Exception:
             return
+        # recorded in bulk by flush_rows
+        self.data['_rows'].append(ln)
+        return
 
     update_data(self.data)
 
@@ -288,10 +359,11 @@ class Lmplog(ReadOnly):
         pass
 
     def parse(self, section, dtype='df'):
-        self.data = copy.deepcopy(blank_output)
+        self.data = blank_output()
 
         for line in self:
             parse_stream(self, line.decode(), to_metal=False)
+        flush_rows(self.data)
 
         outkeys = ['run_type'] + self.data['key']
         output = {k: self.data.get(k, []) for k in outkeys}
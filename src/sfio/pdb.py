@@ -1,8 +1,12 @@
 _all__ = ['Pdb']
 
+import io
+
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
+from . import func
 from .base import ReadOnly, Sectioned
 from .box import Box
 
@@ -43,6 +47,64 @@ section_name = {
 }
 
 
+def _read_fixed_width(buf, widths, names):
+    """Read fixed-width columns into a pyarrow table, like pd.read_fwf.
+    Blank fields are null, and columns are int64, double, or string.
+    """
+    # one row of bytes per non-blank line, padded to the total width
+    width = sum(widths)
+    lines = [line.ljust(width)[:width] for line in buf.split(b'\n')]
+    rows = b''.join([line for line in lines if line.strip()])
+    rows = np.frombuffer(rows, np.uint8).reshape(-1, width)
+
+    columns = {}
+    for name, i1, w in zip(names, np.cumsum(widths), widths):
+        field = rows[:, i1 - w : i1].copy().view(f'S{w}').ravel()
+        field = np.char.strip(field)
+        blank = field == b''
+        if blank.all():
+            columns[name] = pa.nulls(len(field))
+            continue
+        for typ in (np.int64, np.float64):
+            values = np.zeros(len(field), typ)
+            try:
+                values[~blank] = field[~blank].astype(typ)
+            except ValueError:
+                continue
+            columns[name] = pa.array(values, mask=blank)
+            break
+        else:
+            columns[name] = pa.array(field, pa.binary(), mask=blank)
+            columns[name] = columns[name].cast(pa.string())
+    return pa.table(columns)
+
+
+def _records(fd, seek=0):
+    """Yield the starting byte position and record name of each line.
+    Record names are the first 6 bytes of a line, no line split needed.
+    """
+    if isinstance(fd, io.FileIO):
+        # regular file, walk its memory map line-by-line
+        try:
+            mm = func.map_file(fd)
+        except ValueError:
+            return  # empty file
+        with mm:
+            pos, size = seek, len(mm)
+            while pos < size:
+                end = mm.find(b'\n', pos)
+                end = size if end < 0 else end
+                yield pos, mm[pos : min(pos + 6, end)]
+                pos = end + 1
+        return
+
+    # e.g., compressed file
+    pos = seek
+    for line in func.iter_lines(fd):
+        yield pos, line[:6].rstrip(b'\n')
+        pos += len(line)
+
+
 class Pdb(ReadOnly, Sectioned):
     """Protein Data Bank Files"""
 
@@ -50,18 +112,21 @@ class Pdb(ReadOnly, Sectioned):
         with self.open() as fd:
             fd.seek(self.scanned)  # resume from last read
 
-            for line in fd:
-                record = line.split(None, 1)[0]
-                sect = section_name.get(record, None)
+            # a line that repeats the previous record name changes nothing
+            last = None
+            for pos, record in _records(fd, self.scanned):
+                if record == last:
+                    continue
+                last = record
+                sect = section_name.get(record.rstrip(), None)
 
                 if sect not in self.sections:
+                    self.scanned = pos
                     for k in self.sections:
                         self.end_section(k)
                     self.start_section(sect)
-                    self.scanned = fd.tell()
-                    continue
 
-                self.scanned = fd.tell()
+            self.scanned = fd.seek(0, io.SEEK_END)
 
         self.sections['file'] = [0]
 
@@ -121,12 +186,11 @@ class Pdb(ReadOnly, Sectioned):
                 'element',
                 'charge',
             ]
-            atoms = pd.read_fwf(
-                section.f,
+            atoms = _read_fixed_width(
+                section.raw,
                 widths=[6, 6, 4, 1, 4, 1, 4, 4, 8, 8, 8, 6, 6, 6, 4, 2, 2],
                 names=col_labels,
-                dtype_backend='pyarrow',
-            )
+            ).to_pandas(types_mapper=pd.ArrowDtype)
             output = {k: atoms[k].values for k in col_labels}
 
         elif section.name == 'bonds':
@@ -147,8 +211,10 @@ class Pdb(ReadOnly, Sectioned):
                 b[:, 0],
                 b[:, 4],
             ].reshape(-1, 2)
-            bonds = np.unique(b[(b[:, 0] < b[:, 1]), :], axis=0)
-            output = {'atom-1': bonds[:, 0], 'atom-2': bonds[:, 1]}
+            b = b[(b[:, 0] < b[:, 1]), :]
+            # unique pairs as one int64 key each, sorted like rows
+            bonds = np.unique((b[:, 0] << 32) + b[:, 1])
+            output = {'atom-1': bonds >> 32, 'atom-2': bonds & 0xFFFFFFFF}
 
         # output
         if dtype == 'dict':
@@ -1,5 +1,6 @@
 __all__ = ['Psf']
 
+import numpy as np
 import pandas as pd
 
 from .base import ReadOnly, Sectioned
@@ -61,24 +62,25 @@ class Psf(ReadOnly, Sectioned):
             rfmt = {k: map_fmt[col_labels[k][-1]] for k in col_labels}
             # read atoms and create dataframe
             atoms = pd.read_csv(
-                section.f, sep=r'\s+', header=0, names=col_labels.keys()
-            ).astype(rfmt)
-            atoms.sort_index(inplace=True)
+                section.f,
+                sep=r'\s+',
+                header=0,
+                names=list(col_labels),
+                dtype=rfmt,
+            )
             output = {k: atoms[k].values for k in col_labels.keys()}
 
         elif section.name in self.sect_topo:
             # get column labels
             N = min(self.sect_topo.index(section.name) + 2, 4)
             col_labels = [f'atom-{i+1}' for i in range(N)]
-            # read bonds/angles/dihedrals/impropers and create dataframe
-            names = [str(i) for i in range(N * (9 // N))]
-            topos = pd.read_csv(section.f, sep=r'\s+', skiprows=1, names=names)
-            topos = (
-                pd.DataFrame(topos.values.reshape(-1, N), columns=col_labels)
-                .dropna()
-                .astype(int)
-            )
-            output = {k: topos[k].values for k in col_labels}
+            # read bonds/angles/dihedrals/impropers, N atom ids per entry
+            raw = section.raw.partition(b'\n')[2]
+            topos = np.fromstring(raw, dtype=np.int64, sep=' ')
+            # drop an incomplete trailing entry
+            topos = topos[: topos.size - topos.size % N]
+            topos = topos.reshape(-1, N).T.copy()
+            output = dict(zip(col_labels, topos))
 
         # output
         if dtype == 'dict':
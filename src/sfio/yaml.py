@@ -2,6 +2,14 @@
 import yaml
 from yaml import *  # noqa: F403, F401
 
+# LibYAML bindings, if available
+try:
+    from yaml import CSafeDumper as safe_dumper
+    from yaml import CSafeLoader as safe_loader
+except ImportError:
+    from yaml import SafeDumper as safe_dumper
+    from yaml import SafeLoader as safe_loader
+
 dump_kwargs = {
     'sort_keys': False,
     'default_style': None,
@@ -26,16 +34,21 @@ class Yaml(ReadWrite):
 
     def parse(self, section, dtype='dict'):
         fpath = self.name
-        logger.debug(f'read yaml file\n  {fpath}')
-        return deserialize(yaml.safe_load(open(fpath)))
+        logger.debug('read yaml file\n  %s', fpath)
+        with open(fpath, 'rb', buffering=1 << 20) as f:
+            return deserialize(yaml.load(f, Loader=safe_loader))
 
     @classmethod
     def write(cls, fpath, data, **kwargs):
         fpath = abspath(fpath)
-        yaml.safe_dump(
-            serialize(data), open(fpath, 'w'), **{**dump_kwargs, **kwargs}
-        )
-        logger.debug(f'wrote yaml file\n  {fpath}')
+        with open(fpath, 'w', encoding='utf8', buffering=1 << 20) as f:
+            yaml.dump(
+                serialize(data),
+                f,
+                Dumper=safe_dumper,
+                **{**dump_kwargs, **kwargs},
+            )
+        logger.debug('wrote yaml file\n  %s', fpath)
         return fpath
 
 
@@ -43,12 +56,17 @@ class Yaml(ReadWrite):
 
 
 def loads(astr: str):
-    return deserialize(yaml.safe_load(astr))
+    return deserialize(yaml.load(astr, Loader=safe_loader))
 
 
 def dumps(adict: dict, **kwargs):
     stream = io.StringIO()
-    yaml.safe_dump(serialize(adict), stream, **{**dump_kwargs, **kwargs})
+    yaml.dump(
+        serialize(adict),
+        stream,
+        Dumper=safe_dumper,
+        **{**dump_kwargs, **kwargs},
+    )
     stream.seek(0)
     return stream.read().strip()
 
@@ -31,3 +31,22 @@ def test_box_tilt_assignment():
     # upon assignment, tilt remains True for non-orthogonal box
     box.input['allow_tilt'] = False
     assert box.input['allow_tilt'] is True
+
+
+def test_output_follows_input():
+    # cached output is updated when inputs change
+    b = sfio.Box()
+    assert b.output is b.output
+    b['lx'] = 3.0
+    assert b['xhi'] == 3.0
+    b.set_input('0 2 0 3 0 4 0 0 0', typ='lmpdata')
+    assert b['xhi'] == 2.0
+    assert b.output['v'][1, 1] == 3.0
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_dcd_cosine_roundoff():
+    # cosines slightly out of [-1, 1] are clamped, not an error
+    b = sfio.Box()
+    b.set_input([10.0, 0.5, 10.0, 0.0, -1.0 - 1e-7, 10.0], typ='dcd')
+    assert b['alpha'] == 180.0
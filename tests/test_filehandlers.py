@@ -80,3 +80,49 @@ def test_lmpdump_slicing():
     # indexing out of range
     with pytest.raises(IndexError):
         f[[0, 5, 2, 3]]
+
+
+def test_atsk_casting():
+    f = sfio.read(template / 'gold_fcc.atsk')
+    atoms = f.section('atoms')
+    d = atoms.dict
+    assert atoms.df.shape == (len(d['x']), 4)
+    table = atoms.arrow
+    assert table.column_names == ['x', 'y', 'z', 'atomic_number']
+    assert table.column('x').to_numpy().tolist() == d['x'].tolist()
+    assert f.section('comments').arrow.num_rows == 1
+
+
+def test_lmpdump_box_bounds():
+    f = sfio.read(template / 'gold_fcc.dump')
+    boxes = [f.section('box', i).dict for i in range(len(f))]
+    assert [b['allow_tilt'] for b in boxes] == [False, True, False, False]
+    assert all(b['bx'] == b['by'] == b['bz'] == 'pp' for b in boxes)
+    assert f.section('box', 1).obj is not f.section('box', 2).obj
+
+
+def test_lmpdump_parse_frames():
+    f = sfio.read(template / 'gold_fcc.dump')
+    frames = f.parse_frames([3, 1], max_workers=2)
+    assert [df.attrs['timestep'] for df in frames] == [3000, 1000]
+    assert frames[1].equals(f.section('frame', 1).df)
+
+
+def test_lmpdump_write_float_columns(tmp_dir):
+    f = sfio.read(template / 'gold_fcc.dump')
+    df = f.section('frame', 0).df
+    df['vx'], df['q'] = 0.0, 1.0
+    sfio.write(tmp_dir / 'float.dump', df, overwrite=True)
+    df2 = sfio.read(tmp_dir / 'float.dump').section('frame', 0).df
+    assert df2.dtypes.equals(df.dtypes)
+    assert df2.equals(df)
+
+
+def test_atsk_dict_is_writable():
+    f = sfio.read(template / 'gold_fcc.atsk')
+    atoms = f.section('atoms')
+    x = atoms.parse('dict')['x']
+    x[0] = 1.0
+    # views into the memory-mapped file are read-only
+    assert not atoms.parse('view')['x'].flags.writeable
+    assert atoms.parse('view')['x'][0] != 1.0
@@ -18,6 +18,18 @@ def test_lmpdump_scanbychunk():
     assert f.sections == f2.sections
 
 
+def test_lmpdump_scanbymmap():
+    for filename in ['gold_fcc.dump', 'gold_fcc.dump.gz']:
+        f = sfio.file(template / filename, 'lmpdump')
+        f.scan(method='line')
+
+        f2 = sfio.file(template / filename, 'lmpdump')
+        f2.scan(method='mmap')
+
+        assert f.sections == f2.sections
+        assert f.scanned == f2.scanned
+
+
 def test_lmpdata_scanbychunk():
     filename, filetype = 'dimer_cis.data', 'lmpdata'
 
@@ -28,3 +40,45 @@ def test_lmpdata_scanbychunk():
     f2.scan(method='chunk')
 
     assert f.sections == f2.sections
+
+
+def test_read_stale_cache(tmp_path):
+    import json
+
+    data = (template / 'gold_fcc.dump').read_bytes()
+    path = tmp_path / 'gold_fcc.dump'
+    path.write_bytes(data)
+    f = sfio.read(path)
+    with open(tmp_path / '_gold_fcc.dump.cache', 'w') as fc:
+        json.dump(f.cache, fc)
+
+    # rewritten as a shorter file, scan again from the beginning
+    frame3 = f.sections['frame'][4]
+    path.write_bytes(data[:frame3])
+    g = sfio.read(path)
+    assert len(g) == 2
+    assert g.sections == sfio.read(path).sections
+    g[-1]
+
+    # appended, resume from the cached scan
+    path.write_bytes(data)
+    h = sfio.read(path)
+    assert len(h) == 4
+    assert h.sections == f.sections
+
+
+def test_read_legacy_cache(tmp_path):
+    import json
+
+    path = tmp_path / 'gold_fcc.dump'
+    path.write_bytes((template / 'gold_fcc.dump').read_bytes())
+    f = sfio.read(path)
+
+    # older versions cached offsets only, resume from them and add stat
+    fcache = tmp_path / '_gold_fcc.dump.cache'
+    with open(fcache, 'w') as fc:
+        json.dump({'scanned': f.scanned, 'sections': f.sections}, fc)
+    g = sfio.read(path)
+    assert g.sections == f.sections
+    with open(fcache) as fc:
+        assert json.load(fc) == f.cache
@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 import sfio.func as func
@@ -29,3 +31,40 @@ import sfio.func as func
 )
 def test_flatten(inputs, expected_output):
     assert list(func.flatten(inputs)) == expected_output
+
+
+@pytest.mark.parametrize('bufsize', [1, 3, 1 << 20])
+@pytest.mark.parametrize(
+    'data', [b'', b'a', b'a\n', b'\n\nab\ncd', b'ab\r\ncd\n\n', b'abc' * 9]
+)
+def test_iter_lines(data, bufsize):
+    lines = func.iter_lines(io.BytesIO(data), bufsize)
+    assert list(lines) == list(io.BytesIO(data))
+
+
+tiny_dump = (
+    b'ITEM: TIMESTEP\n0\nITEM: NUMBER OF ATOMS\n2\n'
+    b'ITEM: ATOMS id x\n1 0.0\n2 1.5\n'
+) * 3
+
+
+@pytest.mark.parametrize('seek', [0, 5])
+@pytest.mark.parametrize('bufsize', [22, 25, 64, 1 << 20])
+def test_search_in_file(tmp_path, bufsize, seek):
+    patterns = [b'ITEM: TIMESTEP', b'ITEM: ATOMS', None, b'2']
+    # line starts with each pattern, chunk boundaries fall mid-line
+    lines = list(io.BytesIO(tiny_dump[seek:]))
+    starts = [seek + sum(map(len, lines[:i])) for i in range(len(lines))]
+    expected = [
+        None if p is None else [s for s, ln in zip(starts, lines) if p in ln]
+        for p in patterns
+    ]
+
+    fd = io.BytesIO(tiny_dump)
+    assert func.search_in_file(fd, patterns, seek, bufsize) == expected
+
+    # regular files are memory-mapped
+    path = tmp_path / 'tiny.dump'
+    path.write_bytes(tiny_dump)
+    with io.FileIO(path) as fd:
+        assert func.search_in_file(fd, patterns, seek) == expected